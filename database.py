@@ -3,22 +3,142 @@
 Использует SQLite для локального хранения связи workshop_id -> package_id.
 """
 
+import atexit
 import sqlite3
 import os
-from datetime import datetime
-from typing import Optional, List, Tuple
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, List, Tuple, Iterable, Iterator
 from dataclasses import dataclass
 
 
-@dataclass
+# SQL-запросы вынесены в константы: sqlite3 кэширует подготовленные
+# выражения по тексту запроса, и один и тот же объект строки гарантирует
+# попадание в кэш без повторного разбора и планирования.
+_SQL_GET_PACKAGE_ID = "SELECT package_id FROM mods WHERE workshop_id = ?"
+
+_SQL_MOD_EXISTS = "SELECT 1 FROM mods WHERE workshop_id = ? LIMIT 1"
+
+# Дата обработки формируется самим SQLite (локальное время в ISO 8601),
+# без создания datetime и форматирования строки в Python на каждую запись.
+# UPSERT вместо INSERT OR REPLACE: существующая строка обновляется на месте,
+# а при неизменном package_id запись в базу не производится вовсе.
+_SQL_INSERT_MOD = """
+    INSERT INTO mods
+    (workshop_id, package_id, processed_date, collection_url)
+    VALUES (?, ?, strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'), ?)
+    ON CONFLICT(workshop_id) DO UPDATE SET
+        package_id = excluded.package_id,
+        processed_date = excluded.processed_date,
+        collection_url = excluded.collection_url
+    WHERE excluded.package_id IS NOT mods.package_id
+"""
+
+_SQL_GET_ALL_MODS = (
+    "SELECT workshop_id, package_id, processed_date, collection_url FROM mods"
+)
+
+_SQL_CLEAR_LOOKUP = "DELETE FROM lookup_ids"
+
+_SQL_INSERT_LOOKUP = "INSERT OR IGNORE INTO lookup_ids (workshop_id) VALUES (?)"
+
+_SQL_JOIN_LOOKUP = """
+    SELECT m.workshop_id, m.package_id
+    FROM mods m JOIN lookup_ids l USING (workshop_id)
+"""
+
+_SQL_DELETE_MOD = "DELETE FROM mods WHERE workshop_id = ?"
+
+_SQL_CLEAR_MODS = "DELETE FROM mods"
+
+_SQL_GET_META = "SELECT key, value FROM meta WHERE key IN ('count', 'last_update')"
+
+_SQL_RESET_META = "UPDATE meta SET value = CASE key WHEN 'count' THEN '0' END"
+
+# Триггер уменьшения счётчика записей. Построчный триггер на DELETE
+# отключает в SQLite быструю очистку таблицы, поэтому clear_database
+# удаляет его на время полной очистки и создаёт заново
+_SQL_CREATE_DELETE_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS mods_ad AFTER DELETE ON mods BEGIN
+        UPDATE meta SET value = CAST(CAST(value AS INTEGER) - 1 AS TEXT)
+        WHERE key = 'count';
+    END
+"""
+
+_SQL_DROP_DELETE_TRIGGER = "DROP TRIGGER IF EXISTS mods_ad"
+
+# Версия схемы хранится в PRAGMA user_version; при совпадении
+# создание схемы при запуске пропускается целиком
+SCHEMA_VERSION = 1
+
+# Полная схема базы. Счётчик записей и дата последнего изменения
+# поддерживаются триггерами в таблице meta, поэтому статистика читается
+# без сканирования mods. Покрывающий индекс idx_pkg_ws обслуживает поиск
+# по package_id без чтения строк таблицы; поиск по workshop_id идёт
+# по индексу первичного ключа.
+SCHEMA_SQL = f"""
+    CREATE TABLE IF NOT EXISTS mods (
+        workshop_id TEXT PRIMARY KEY,
+        package_id TEXT NOT NULL,
+        processed_date TEXT NOT NULL,
+        collection_url TEXT
+    );
+    
+    CREATE INDEX IF NOT EXISTS idx_pkg_ws ON mods(package_id, workshop_id);
+    DROP INDEX IF EXISTS idx_package_id;
+    
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    
+    -- Заполнение для базы, созданной до появления meta
+    INSERT OR IGNORE INTO meta (key, value)
+    SELECT 'count', CAST(COUNT(*) AS TEXT) FROM mods
+    UNION ALL
+    SELECT 'last_update', MAX(processed_date) FROM mods;
+    
+    CREATE TRIGGER IF NOT EXISTS mods_ai AFTER INSERT ON mods BEGIN
+        INSERT INTO meta (key, value) VALUES ('count', '1')
+        ON CONFLICT(key) DO UPDATE SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT);
+        INSERT INTO meta (key, value) VALUES ('last_update', NEW.processed_date)
+        ON CONFLICT(key) DO UPDATE SET value = NEW.processed_date;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS mods_au AFTER UPDATE ON mods BEGIN
+        INSERT INTO meta (key, value) VALUES ('last_update', NEW.processed_date)
+        ON CONFLICT(key) DO UPDATE SET value = NEW.processed_date;
+    END;
+    
+    {_SQL_CREATE_DELETE_TRIGGER};
+    
+    ANALYZE;
+"""
+
+# Временная таблица для пакетного поиска по большому списку ID
+# (существует только в рамках соединения, поэтому создаётся при каждом запуске)
+_SQL_CREATE_LOOKUP = """
+    CREATE TEMP TABLE IF NOT EXISTS lookup_ids (
+        workshop_id TEXT PRIMARY KEY
+    )
+"""
+
+
+@dataclass(slots=True, frozen=True)
 class ModRecord:
-    """Запись о моде в базе данных."""
+    """Запись о моде в базе данных (неизменяемая, без __dict__ на экземпляр)."""
     workshop_id: str
     package_id: str
     processed_date: str
     collection_url: Optional[str] = None
 
 
+def _mod_record_factory(cursor: sqlite3.Cursor, row: tuple) -> ModRecord:
+    """Фабрика строк: порядок столбцов совпадает с порядком полей ModRecord."""
+    return ModRecord(*row)
+
+
 class ModDatabase:
     """
     Класс для работы с базой данных модов.
@@ -26,6 +146,15 @@ class ModDatabase:
     повторной загрузки и обработки модов.
     """
     
+    # Начиная с этого размера списка поиск идёт через временную таблицу
+    LOOKUP_TABLE_THRESHOLD = 500
+    
+    # Максимальный размер кэша package_id в памяти
+    PACKAGE_CACHE_SIZE = 10000
+    
+    # После пакетной вставки такого размера обновляется статистика планировщика
+    ANALYZE_THRESHOLD = 1000
+    
     def __init__(self, db_path: str = "mods_cache.db"):
         """
         Инициализация базы данных.
@@ -34,30 +163,130 @@ class ModDatabase:
             db_path: Путь к файлу базы данных SQLite.
         """
         self.db_path = db_path
+        
+        # LRU-кэш workshop_id -> package_id (None - мод отсутствует в базе).
+        # Кэш общий для потоков и защищён блокировкой; поколение
+        # увеличивается при каждой записи, чтобы читатель не вернул в кэш
+        # значение, прочитанное до изменения базы
+        self._pkg_cache: OrderedDict[str, Optional[str]] = OrderedDict()
+        self._pkg_cache_lock = threading.Lock()
+        self._pkg_cache_generation = 0
+        
+        # Тексты запросов с IN-списком по числу параметров
+        self._in_stmt_cache: dict[int, str] = {}
+        
+        # Одно долгоживущее пишущее соединение на всё время работы вместо
+        # открытия файла базы на каждый вызов. Запись сериализуется блокировкой,
+        # чтение идёт через отдельные соединения потоков и в режиме WAL
+        # не блокируется записью.
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        
+        self._wconn = self._connect()
+        # page_size действует только для новой базы и до перехода в WAL,
+        # поэтому задаётся первым.
+        self._wconn.executescript("""
+            PRAGMA page_size=4096;
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+        """)
+        
         self._init_database()
+        
+        # Соединение закрывается (с PRAGMA optimize) и при выходе из программы
+        atexit.register(self.close)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Открыть соединение с общими настройками.
+        
+        isolation_level=None - режим автокоммита, транзакции открываются явно.
+        mmap_size - чтение страниц B-дерева напрямую из отображённой памяти,
+        без системных вызовов read().
+        
+        Returns:
+            Новое соединение с базой данных.
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256
+        )
+        conn.executescript("""
+            PRAGMA mmap_size=268435456;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-64000;
+            PRAGMA busy_timeout=60000;
+        """)
+        return conn
+    
+    def _reader(self) -> sqlite3.Connection:
+        """
+        Получить читающее соединение текущего потока.
+        
+        Соединение открывается при первом обращении из потока и работает
+        в режиме query_only. Для базы в памяти отдельные соединения
+        увидели бы другую базу, поэтому используется пишущее соединение.
+        
+        Returns:
+            Соединение для чтения.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        
+        if self.db_path == ":memory:":
+            return self._wconn
+        
+        conn = self._connect()
+        conn.execute("PRAGMA query_only=1")
+        self._local.conn = conn
+        with self._readers_lock:
+            self._readers.append(conn)
+        return conn
     
     def _init_database(self) -> None:
-        """Создание таблиц базы данных, если они не существуют."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Таблица для хранения информации о модах
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS mods (
-                    workshop_id TEXT PRIMARY KEY,
-                    package_id TEXT NOT NULL,
-                    processed_date TEXT NOT NULL,
-                    collection_url TEXT
-                )
-            """)
-            
-            # Индекс для быстрого поиска по package_id
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_package_id 
-                ON mods(package_id)
-            """)
-            
-            conn.commit()
+        """Создание схемы базы данных, если её версия устарела."""
+        version = self._wconn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            self._wconn.executescript(
+                "BEGIN IMMEDIATE;"
+                + SCHEMA_SQL
+                + f"PRAGMA user_version = {SCHEMA_VERSION};"
+                + "COMMIT;"
+            )
+        
+        self._wconn.execute(_SQL_CREATE_LOOKUP)
+    
+    def close(self) -> None:
+        """
+        Закрыть соединение с базой данных.
+        
+        Перед закрытием выполняется PRAGMA optimize - SQLite обновляет
+        статистику планировщика только там, где она устарела.
+        Повторный вызов безопасен.
+        """
+        if self._wconn is None:
+            return
+        
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self._local = threading.local()
+        
+        with self._write_lock:
+            try:
+                self._wconn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            finally:
+                self._wconn.close()
+                self._wconn = None
+                atexit.unregister(self.close)
     
     def get_package_id(self, workshop_id: str) -> Optional[str]:
         """
@@ -69,14 +298,45 @@ class ModDatabase:
         Returns:
             package_id если мод найден в базе, иначе None.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT package_id FROM mods WHERE workshop_id = ?",
-                (workshop_id,)
-            )
-            result = cursor.fetchone()
-            return result[0] if result else None
+        cache = self._pkg_cache
+        with self._pkg_cache_lock:
+            if workshop_id in cache:
+                cache.move_to_end(workshop_id)
+                return cache[workshop_id]
+            generation = self._pkg_cache_generation
+        
+        cursor = self._reader().execute(_SQL_GET_PACKAGE_ID, (workshop_id,))
+        result = cursor.fetchone()
+        package_id = result[0] if result else None
+        
+        with self._pkg_cache_lock:
+            # Запись в базу во время запроса: прочитанное значение могло
+            # устареть и в кэш не попадает
+            if generation == self._pkg_cache_generation:
+                cache[workshop_id] = package_id
+                if len(cache) > self.PACKAGE_CACHE_SIZE:
+                    cache.popitem(last=False)
+        
+        return package_id
+    
+    def _invalidate_package_cache(self, workshop_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Сбросить записи кэша package_id после изменения базы.
+        
+        Вызывается после фиксации записи, чтобы читатели, начавшие запрос
+        до неё, не сохранили в кэше старое значение.
+        
+        Args:
+            workshop_ids: Изменённые workshop ID (None - сбросить весь кэш).
+        """
+        with self._pkg_cache_lock:
+            self._pkg_cache_generation += 1
+            if workshop_ids is None:
+                self._pkg_cache.clear()
+            else:
+                pop = self._pkg_cache.pop
+                for workshop_id in workshop_ids:
+                    pop(workshop_id, None)
     
     def add_mod(self, workshop_id: str, package_id: str, 
                 collection_url: Optional[str] = None) -> None:
@@ -88,16 +348,58 @@ class ModDatabase:
             package_id: Идентификатор пакета из About.xml.
             collection_url: URL коллекции, из которой был получен мод.
         """
-        processed_date = datetime.now().isoformat()
+        with self._write_lock:
+            self._wconn.execute(
+                _SQL_INSERT_MOD,
+                (workshop_id, package_id, collection_url)
+            )
+        self._invalidate_package_cache((workshop_id,))
+    
+    def add_mods(self, mods: Iterable[Tuple[str, str, Optional[str]]]) -> None:
+        """
+        Добавить или обновить несколько записей о модах одной транзакцией.
+        
+        Args:
+            mods: Кортежи (workshop_id, package_id, collection_url).
+        """
+        mods = list(mods)
+        
+        with self._write_lock:
+            cursor = self._wconn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(_SQL_INSERT_MOD, mods)
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+            
+            if len(mods) > self.ANALYZE_THRESHOLD:
+                cursor.execute("ANALYZE")
+        
+        self._invalidate_package_cache(workshop_id for workshop_id, _, _ in mods)
+    
+    @contextmanager
+    def bulk_import(self) -> Iterator["ModDatabase"]:
+        """
+        Режим массового импорта без синхронизации с диском на каждую транзакцию.
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO mods 
-                (workshop_id, package_id, processed_date, collection_url)
-                VALUES (?, ?, ?, ?)
-            """, (workshop_id, package_id, processed_date, collection_url))
-            conn.commit()
+        База является производным кэшем и всегда может быть восстановлена
+        из Steam, поэтому на время импорта включается synchronous=OFF.
+        По выходу журнал WAL переносится в основной файл и усекается,
+        затем восстанавливается synchronous=NORMAL.
+        
+        Yields:
+            Текущий экземпляр базы данных.
+        """
+        with self._write_lock:
+            self._wconn.execute("PRAGMA synchronous=OFF")
+        try:
+            yield self
+        finally:
+            with self._write_lock:
+                self._wconn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._wconn.execute("PRAGMA synchronous=NORMAL")
     
     def mod_exists(self, workshop_id: str) -> bool:
         """
@@ -109,7 +411,8 @@ class ModDatabase:
         Returns:
             True если мод найден, иначе False.
         """
-        return self.get_package_id(workshop_id) is not None
+        cursor = self._reader().execute(_SQL_MOD_EXISTS, (workshop_id,))
+        return cursor.fetchone() is not None
     
     def get_all_mods(self) -> List[ModRecord]:
         """
@@ -118,21 +421,31 @@ class ModDatabase:
         Returns:
             Список всех записей ModRecord.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT workshop_id, package_id, processed_date, collection_url FROM mods"
-            )
-            results = cursor.fetchall()
-            return [
-                ModRecord(
-                    workshop_id=row[0],
-                    package_id=row[1],
-                    processed_date=row[2],
-                    collection_url=row[3]
-                )
-                for row in results
-            ]
+        cursor = self._reader().cursor()
+        cursor.row_factory = _mod_record_factory
+        cursor.execute(_SQL_GET_ALL_MODS)
+        return cursor.fetchall()
+    
+    def iter_all_mods(self, batch_size: int = 1000) -> Iterator[ModRecord]:
+        """
+        Перебрать записи о модах без загрузки всей таблицы в память.
+        
+        Args:
+            batch_size: Количество строк, читаемых из SQLite за один раз.
+            
+        Yields:
+            Записи ModRecord.
+        """
+        cursor = self._reader().cursor()
+        cursor.row_factory = _mod_record_factory
+        cursor.arraysize = batch_size
+        cursor.execute(_SQL_GET_ALL_MODS)
+        
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield from rows
     
     def get_mods_by_workshop_ids(self, workshop_ids: List[str]) -> dict:
         """
@@ -147,16 +460,55 @@ class ModDatabase:
         if not workshop_ids:
             return {}
         
-        placeholders = ",".join("?" * len(workshop_ids))
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                f"SELECT workshop_id, package_id FROM mods WHERE workshop_id IN ({placeholders})",
-                workshop_ids
-            )
-            results = cursor.fetchall()
+        if len(workshop_ids) > self.LOOKUP_TABLE_THRESHOLD:
+            # Большие списки не помещаются в лимит параметров SQLite,
+            # поэтому ID загружаются во временную таблицу и соединяются.
+            # Временная таблица принадлежит пишущему соединению.
+            with self._write_lock:
+                cursor = self._wconn.cursor()
+                cursor.execute("BEGIN")
+                try:
+                    cursor.execute(_SQL_CLEAR_LOOKUP)
+                    cursor.executemany(
+                        _SQL_INSERT_LOOKUP,
+                        ((workshop_id,) for workshop_id in workshop_ids)
+                    )
+                    cursor.execute(_SQL_JOIN_LOOKUP)
+                    results = cursor.fetchall()
+                finally:
+                    cursor.execute("COMMIT")
             return {row[0]: row[1] for row in results}
+        
+        # Размер списка округляется до степени двойки (дополнение пустыми
+        # ID, которых нет в базе), чтобы число различных текстов запроса
+        # было логарифмическим и подготовленные выражения брались из кэша
+        params = list(workshop_ids)
+        size = 1 << (len(params) - 1).bit_length()
+        params.extend([""] * (size - len(params)))
+        
+        cursor = self._reader().execute(self._in_sql(size), params)
+        results = cursor.fetchall()
+        return {row[0]: row[1] for row in results}
+    
+    def _in_sql(self, n: int) -> str:
+        """
+        Получить текст запроса поиска по IN-списку из n параметров.
+        
+        Один и тот же объект строки для одного n гарантирует повторное
+        использование подготовленного выражения из кэша sqlite3.
+        
+        Args:
+            n: Количество параметров в IN-списке.
+            
+        Returns:
+            Текст SQL-запроса.
+        """
+        sql = self._in_stmt_cache.get(n)
+        if sql is None:
+            placeholders = ",".join("?" * n)
+            sql = f"SELECT workshop_id, package_id FROM mods WHERE workshop_id IN ({placeholders})"
+            self._in_stmt_cache[n] = sql
+        return sql
     
     def delete_mod(self, workshop_id: str) -> bool:
         """
@@ -168,14 +520,44 @@ class ModDatabase:
         Returns:
             True если запись была удалена, False если не найдена.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM mods WHERE workshop_id = ?",
-                (workshop_id,)
-            )
-            conn.commit()
-            return cursor.rowcount > 0
+        with self._write_lock:
+            cursor = self._wconn.execute(_SQL_DELETE_MOD, (workshop_id,))
+        
+        deleted = cursor.rowcount > 0
+        if deleted:
+            self._invalidate_package_cache((workshop_id,))
+        return deleted
+    
+    def delete_mods(self, workshop_ids: Iterable[str]) -> int:
+        """
+        Удалить несколько записей о модах одной транзакцией.
+        
+        Args:
+            workshop_ids: Workshop ID модов для удаления.
+            
+        Returns:
+            Количество удалённых записей.
+        """
+        workshop_ids = list(workshop_ids)
+        
+        with self._write_lock:
+            cursor = self._wconn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(
+                    _SQL_DELETE_MOD,
+                    ((workshop_id,) for workshop_id in workshop_ids)
+                )
+                # rowcount после executemany - сумма по всем наборам параметров
+                deleted = cursor.rowcount
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+        
+        self._invalidate_package_cache(workshop_ids)
+        
+        return deleted
     
     def clear_database(self) -> int:
         """
@@ -184,13 +566,44 @@ class ModDatabase:
         Returns:
             Количество удалённых записей.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM mods")
-            count = cursor.fetchone()[0]
-            cursor.execute("DELETE FROM mods")
-            conn.commit()
-            return count
+        with self._write_lock:
+            cursor = self._wconn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # Без построчного триггера DELETE без условия очищает таблицу
+                # целиком, а не по строкам; счётчик всё равно сбрасывается
+                cursor.execute(_SQL_DROP_DELETE_TRIGGER)
+                cursor.execute(_SQL_CLEAR_MODS)
+                count = cursor.rowcount
+                if count < 0:
+                    count = cursor.execute("SELECT changes()").fetchone()[0]
+                
+                cursor.execute(_SQL_RESET_META)
+                cursor.execute(_SQL_CREATE_DELETE_TRIGGER)
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+        self._invalidate_package_cache()
+        return count
+    
+    def truncate_database(self) -> None:
+        """
+        Полностью пересоздать базу данных.
+        
+        Удаляет таблицу целиком и сжимает файл (VACUUM) - для больших баз
+        значительно быстрее построчного удаления и освобождает место на диске.
+        """
+        with self._write_lock:
+            self._wconn.executescript("""
+                DROP TABLE IF EXISTS mods;
+                DROP INDEX IF EXISTS idx_pkg_ws;
+                DROP TABLE IF EXISTS meta;
+                PRAGMA user_version = 0;
+                VACUUM;
+            """)
+            self._init_database()
+        self._invalidate_package_cache()
     
     def get_stats(self) -> dict:
         """
@@ -199,24 +612,13 @@ class ModDatabase:
         Returns:
             Словарь со статистикой (количество модов, дата последнего обновления и т.д.)
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Общее количество модов
-            cursor.execute("SELECT COUNT(*) FROM mods")
-            total_count = cursor.fetchone()[0]
-            
-            # Дата последнего добавления
-            cursor.execute(
-                "SELECT MAX(processed_date) FROM mods"
-            )
-            last_update = cursor.fetchone()[0]
-            
-            return {
-                "total_mods": total_count,
-                "last_update": last_update,
-                "database_path": self.db_path
-            }
+        meta = dict(self._reader().execute(_SQL_GET_META).fetchall())
+        
+        return {
+            "total_mods": int(meta.get("count") or 0),
+            "last_update": meta.get("last_update"),
+            "database_path": self.db_path
+        }
 
 
 # Пример использования
@@ -234,3 +636,5 @@ if __name__ == "__main__":
     
     # Статистика
     print(f"Статистика: {db.get_stats()}")
+    
+    db.close()
@@ -5,26 +5,92 @@
 
 import sys
 import os
-import asyncio
-from datetime import datetime
-from typing import Optional, List
-from concurrent.futures import ThreadPoolExecutor
+import time
+import threading
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, List, Tuple, Iterator
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton, QTextEdit, QRadioButton,
+    QLabel, QLineEdit, QPushButton, QPlainTextEdit, QRadioButton,
     QButtonGroup, QGroupBox, QFileDialog, QProgressBar, QSpinBox,
     QFrame, QSplitter, QMessageBox, QCheckBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QTextCursor, QIcon
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QUrl
+from PyQt6.QtGui import QFont, QIcon, QDesktopServices, QTextCursor
 
 # Импорт модулей приложения
 from database import ModDatabase
-from steam_handler import SteamHandler, CollectionInfo, DownloadStatus
+from steam_handler import (
+    SteamHandler, CollectionInfo, DownloadResult, DownloadStatus,
+    DOWNLOAD_BATCH_SIZE, MAX_PARALLEL_DOWNLOADS, DEFAULT_DOWNLOAD_TIMEOUT
+)
 from xml_processor import XmlProcessor, ModInfo
-from settings import SettingsManager, WorkMode
-from styles import get_main_stylesheet, get_log_html_style, COLORS
+from settings import SettingsManager, WorkMode, LOG_MAX_BLOCKS_MIN, LOG_MAX_BLOCKS_MAX
+from styles import (
+    get_main_stylesheet, get_log_html_style, get_log_plain_text,
+    LOG_DOCUMENT_STYLESHEET, COLORS
+)
+
+
+# Моноширинный шрифт панели логов
+LOG_FONT_FAMILY = "Consolas"
+
+# Интервал сброса накопленных сообщений лога и прогресса в UI (мс)
+UI_FLUSH_INTERVAL_MS = 50
+
+# Задержка автосохранения настроек после последнего изменения (мс)
+SETTINGS_SAVE_DELAY_MS = 500
+
+# Задержка применения размера шрифта логов после последнего изменения (мс)
+LOG_FONT_APPLY_DELAY_MS = 150
+
+# Стиль неактивного поля пути, вычисляется один раз при импорте
+_MUTED_INPUT_STYLE = f"color: {COLORS['text_muted']};"
+
+
+@lru_cache(maxsize=None)
+def _log_font(size: int, family: str = LOG_FONT_FAMILY) -> QFont:
+    """
+    Получение шрифта логов с кэшированием.
+    
+    QFont передаётся в виджеты по значению, поэтому один экземпляр
+    на каждый размер можно безопасно переиспользовать.
+    
+    Args:
+        size: Размер шрифта в пунктах
+        family: Семейство шрифта
+        
+    Returns:
+        Общий экземпляр QFont
+    """
+    return QFont(family, size)
+
+
+# Последняя отформатированная секунда для меток времени лога: (секунда, "ЧЧ:ММ:СС").
+# Кортеж заменяется целиком, поэтому чтение из нескольких потоков безопасно
+_log_timestamp_cache: Tuple[int, str] = (-1, "")
+
+
+def _log_timestamp() -> str:
+    """
+    Метка времени для строки лога.
+    
+    Секундная точность позволяет форматировать время не чаще раза
+    в секунду, а не для каждого сообщения.
+    
+    Returns:
+        Текущее время в формате ЧЧ:ММ:СС
+    """
+    global _log_timestamp_cache
+    now = int(time.time())
+    second, text = _log_timestamp_cache
+    if now != second:
+        text = time.strftime("%H:%M:%S", time.localtime(now))
+        _log_timestamp_cache = (now, text)
+    return text
 
 
 class WorkerThread(QThread):
@@ -34,11 +100,15 @@ class WorkerThread(QThread):
     """
     
     # Сигналы для обновления UI
-    log_signal = pyqtSignal(str, str)  # message, level
+    logs_ready_signal = pyqtSignal()  # в буфере появились сообщения, см. take_logs()
     progress_signal = pyqtSignal(int, int)  # current, total
     finished_signal = pyqtSignal(bool, str)  # success, message
     stats_signal = pyqtSignal(int, int, int)  # processed, skipped, errors
     
+    # Минимальный интервал между обновлениями прогресса и статистики: не
+    # чаще, чем UI всё равно перерисовывает их по своему таймеру (20 Гц)
+    UI_EMIT_INTERVAL = UI_FLUSH_INTERVAL_MS / 1000
+    
     def __init__(
         self,
         collection_url: str,
@@ -48,7 +118,9 @@ class WorkerThread(QThread):
         work_mode: WorkMode,
         download_path: str,
         include_workshop_ids: bool = True,
-        verbose: bool = False
+        verbose: bool = False,
+        download_timeout: int = DEFAULT_DOWNLOAD_TIMEOUT,
+        refresh_collection: bool = False
     ):
         super().__init__()
         self.collection_url = collection_url
@@ -59,17 +131,86 @@ class WorkerThread(QThread):
         self.download_path = download_path
         self.include_workshop_ids = include_workshop_ids
         self.verbose = verbose
+        self.download_timeout = download_timeout
+        self.refresh_collection = refresh_collection
         
-        self._stop_requested = False
+        # Event вместо bool: флаг читается из пула загрузок и таймеров
+        # ожидания steamcmd в SteamHandler
+        self._stop_event = threading.Event()
         self.steam_handler: Optional[SteamHandler] = None
+        self._last_ui_emit = 0.0
+        
+        # Буфер сообщений лога: пишется из рабочего потока и пула загрузок,
+        # забирается UI пачкой; сигнал отправляется только на первое
+        # сообщение после очередного take_logs()
+        self._log_buf: List[Tuple[str, str]] = []
+        self._log_buf_lock = threading.Lock()
+        self._log_notified = False
         
     def log(self, message: str, level: str = "INFO") -> None:
-        """Отправить сообщение в лог."""
-        self.log_signal.emit(message, level)
+        """Отправить сообщение в лог (DEBUG - только при расширенном логировании)."""
+        if level == "DEBUG" and not self.verbose:
+            return
+        # HTML строка готовится здесь, в рабочем потоке - UI-поток
+        # только вставляет готовые строки в панель логов
+        timestamp = _log_timestamp()
+        entry = (
+            get_log_html_style(level, message, timestamp, line_break=False),
+            get_log_plain_text(level, message, timestamp)
+        )
+        with self._log_buf_lock:
+            self._log_buf.append(entry)
+            if self._log_notified:
+                return
+            self._log_notified = True
+        self.logs_ready_signal.emit()
+    
+    def take_logs(self) -> List[Tuple[str, str]]:
+        """
+        Забрать накопленные сообщения лога.
+        
+        Returns:
+            Список пар (HTML строка, текст без разметки) в порядке поступления
+        """
+        with self._log_buf_lock:
+            messages, self._log_buf = self._log_buf, []
+            self._log_notified = False
+        return messages
+    
+    def _emit_state(
+        self,
+        current: int,
+        total: int,
+        processed: int,
+        skipped: int,
+        errors: int,
+        force: bool = False
+    ) -> None:
+        """
+        Отправить прогресс и статистику в UI не чаще UI_EMIT_INTERVAL.
+        
+        Промежуточные обновления, пришедшие чаще частоты отрисовки,
+        отбрасываются; итоговое состояние отправляется с force=True.
+        
+        Args:
+            current: Количество обработанных модов.
+            total: Общее количество модов.
+            processed: Загружено и обработано.
+            skipped: Пропущено (кэш или уже загружены).
+            errors: Количество ошибок.
+            force: Отправить независимо от интервала.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_ui_emit < self.UI_EMIT_INTERVAL:
+            return
+        
+        self._last_ui_emit = now
+        self.progress_signal.emit(current, total)
+        self.stats_signal.emit(processed, skipped, errors)
     
     def stop(self) -> None:
         """Запросить остановку обработки."""
-        self._stop_requested = True
+        self._stop_event.set()
         if self.steam_handler:
             self.steam_handler.stop()
     
@@ -82,14 +223,22 @@ class WorkerThread(QThread):
         - Режим 2 (TEMPORARY): сначала выполняется обработка как в режиме 1,
           затем все скачанные моды удаляются после успешной генерации XML
         """
+        # asyncio и concurrent.futures нужны только во время обработки -
+        # импорт откладывается, чтобы не замедлять запуск приложения
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        db: Optional[ModDatabase] = None
         try:
             # Инициализация компонентов
             db = ModDatabase()
             self.steam_handler = SteamHandler(
                 steamcmd_path=self.steamcmd_path,
                 download_dir=self.download_path if self.download_path else None,
-                log_callback=self.log
+                log_callback=self.log,
+                download_timeout=self.download_timeout
             )
+            self.steam_handler.set_stop_flag(self._stop_event.is_set)
             xml_processor = XmlProcessor(log_callback=self.log)
             
             # Проверка steamcmd
@@ -106,19 +255,19 @@ class WorkerThread(QThread):
             self.log(f"Папка загрузки модов: {self.steam_handler.download_dir}", "INFO")
             self.log("Начало обработки коллекции...", "INFO")
             
-            # Получение списка модов из коллекции
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
+            # Получение списка модов из коллекции; asyncio.run сам создаёт
+            # цикл событий и закрывает его вместе с асинхронными генераторами
+            # и пулом потоков по умолчанию
             try:
-                collection_info = loop.run_until_complete(
-                    self.steam_handler.fetch_collection_mods(self.collection_url)
+                collection_info = asyncio.run(
+                    self.steam_handler.fetch_collection_mods(
+                        self.collection_url,
+                        force_refresh=self.refresh_collection
+                    )
                 )
             except Exception as e:
                 self.finished_signal.emit(False, f"Ошибка получения коллекции: {str(e)}")
                 return
-            finally:
-                loop.close()
             
             mod_ids = collection_info.mod_ids
             total_mods = len(mod_ids)
@@ -130,126 +279,199 @@ class WorkerThread(QThread):
             skipped = 0
             errors = 0
             
-            # Список успешно обработанных модов
-            mod_infos: List[ModInfo] = []
+            # Успешно обработанные моды по позиции в коллекции: загрузки
+            # завершаются в произвольном порядке, а порядок модов в XML
+            # должен совпадать с порядком коллекции
+            mod_slots: List[Optional[ModInfo]] = [None] * total_mods
+            
+            # Моды, которые нужно скачать: (позиция в коллекции, workshop_id)
+            to_download: List[tuple] = []
+            
+            # Записи для БД копятся в памяти и сохраняются одной транзакцией
+            db_rows: List[tuple] = []
+            
+            # Количество модов, обработка которых завершена (для прогресса)
+            completed = 0
             
             # Список загруженных модов для последующего удаления (режим 2)
             downloaded_mods: List[str] = []
             
+            # package_id из кэша БД одним запросом вместо запроса на каждый мод
+            cached_package_ids = db.get_mods_by_workshop_ids(mod_ids)
+            
+            # Уже загруженные моды - одним чтением каталога вместо проверки
+            # файловой системы для каждого мода
+            downloaded_paths = self.steam_handler.scan_downloaded_mods()
+            
             # Обработка каждого мода
-            for i, workshop_id in enumerate(mod_ids):
-                if self._stop_requested:
-                    self.log("Обработка остановлена пользователем", "WARNING")
-                    break
-                
-                self.progress_signal.emit(i + 1, total_mods)
+            try:
+                # Этап 1: моды из кэша БД и уже загруженные моды. Методы и
+                # неизменные в цикле значения получаются один раз до цикла
+                get_cached = cached_package_ids.get
+                get_downloaded = downloaded_paths.get
+                extract = xml_processor.extract_package_id
+                emit_state = self._emit_state
+                log = self.log
+                add_row = db_rows.append
+                queue_download = to_download.append
+                collection_url = self.collection_url
+                trust_cache = self.work_mode == WorkMode.TEMPORARY
+                cache_log_level = "DEBUG" if self.verbose else "INFO"
                 
-                # В режиме 2 пропускаем проверку кэша - сначала обрабатываем все моды
-                # (режим 2 вызывает логику режима 1 для скачивания и обработки)
-                if self.work_mode == WorkMode.TEMPORARY:
-                    cached_package_id = db.get_package_id(workshop_id)
-                    if cached_package_id:
-                        self.log(
+                for i, workshop_id in enumerate(mod_ids):
+                    if self._stop_event.is_set():
+                        break
+                    
+                    # Кэш БД: в режиме 2 моды удаляются после обработки, и кэш -
+                    # единственный источник; в режиме 1 запись используется, только
+                    # если папка мода на месте - тогда About.xml не разбирается
+                    cached_package_id = get_cached(workshop_id)
+                    if cached_package_id and (trust_cache or workshop_id in downloaded_paths):
+                        log(
                             f"Мод {workshop_id} найден в кэше БД: {cached_package_id}",
-                            "DEBUG" if self.verbose else "INFO"
+                            cache_log_level
                         )
-                        mod_infos.append(ModInfo(
+                        mod_slots[i] = ModInfo(
                             workshop_id=workshop_id,
                             package_id=cached_package_id
-                        ))
+                        )
                         skipped += 1
-                        self.stats_signal.emit(processed, skipped, errors)
+                        completed += 1
+                        emit_state(completed, total_mods, processed, skipped, errors)
                         continue
-                
-                # Проверка наличия загруженного мода
-                if self.steam_handler.is_mod_downloaded(workshop_id):
-                    mod_path = self.steam_handler.get_mod_path(workshop_id)
-                    mod_info = xml_processor.extract_package_id(mod_path, workshop_id)
                     
-                    if mod_info:
-                        self.log(
-                            f"Мод {workshop_id} уже загружен: {mod_info.package_id}",
-                            "INFO"
-                        )
-                        mod_infos.append(mod_info)
+                    # Проверка наличия загруженного мода
+                    mod_path = get_downloaded(workshop_id)
+                    if mod_path:
+                        mod_info = extract(mod_path, workshop_id)
                         
-                        # Сохраняем в БД для режима 2
-                        if self.work_mode == WorkMode.TEMPORARY:
-                            db.add_mod(workshop_id, mod_info.package_id, self.collection_url)
-                        
-                        skipped += 1
-                        self.stats_signal.emit(processed, skipped, errors)
-                        continue
-                
-                # Загрузка мода
-                result = self.steam_handler.download_mod(workshop_id)
-                
-                if result.status == DownloadStatus.SUCCESS:
-                    # Запоминаем загруженный мод для возможного удаления в режиме 2
-                    downloaded_mods.append(workshop_id)
+                        if mod_info:
+                            log(
+                                f"Мод {workshop_id} уже загружен: {mod_info.package_id}",
+                                "INFO"
+                            )
+                            mod_slots[i] = mod_info
+                            
+                            # Сохраняем в БД, чтобы следующий запуск взял packageId из кэша
+                            add_row((workshop_id, mod_info.package_id, collection_url))
+                            
+                            skipped += 1
+                            completed += 1
+                            emit_state(completed, total_mods, processed, skipped, errors)
+                            continue
                     
-                    # Извлечение packageId
-                    mod_info = xml_processor.extract_package_id(
-                        result.mod_path,
-                        workshop_id
+                    queue_download((i, workshop_id))
+                
+                # Этап 2: параллельная загрузка через steamcmd. Моды делятся
+                # на пачки (один запуск steamcmd на пачку), каждая пачка
+                # загружается в собственную директорию установки
+                if to_download and not self._stop_event.is_set():
+                    batch_size = max(1, min(
+                        DOWNLOAD_BATCH_SIZE,
+                        -(-len(to_download) // MAX_PARALLEL_DOWNLOADS)
+                    ))
+                    batches = [
+                        to_download[k:k + batch_size]
+                        for k in range(0, len(to_download), batch_size)
+                    ]
+                    max_workers = min(MAX_PARALLEL_DOWNLOADS, len(batches))
+                    self.log(
+                        f"Загрузка {len(to_download)} модов "
+                        f"({len(batches)} запусков steamcmd, {max_workers} потоков)...",
+                        "INFO"
                     )
                     
-                    if mod_info:
-                        mod_infos.append(mod_info)
+                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                        futures = {
+                            executor.submit(
+                                self._download_and_extract,
+                                [workshop_id for _, workshop_id in batch],
+                                xml_processor
+                            ): batch
+                            for batch in batches
+                        }
                         
-                        # Сохранение в базу данных
-                        db.add_mod(
-                            workshop_id,
-                            mod_info.package_id,
-                            self.collection_url
-                        )
-                        
-                        processed += 1
-                        self.log(
-                            f"Обработан мод {workshop_id}: {mod_info.package_id}",
-                            "SUCCESS"
-                        )
-                    else:
-                        errors += 1
-                        self.log(
-                            f"Не удалось извлечь packageId для мода {workshop_id}",
-                            "WARNING"
-                        )
-                else:
-                    errors += 1
-                    self.log(
-                        f"Ошибка загрузки мода {workshop_id}: {result.error_message}",
-                        "ERROR"
-                    )
+                        for future in as_completed(futures):
+                            batch = futures[future]
+                            for (i, workshop_id), (result, mod_info) in zip(batch, future.result()):
+                                completed += 1
+                                
+                                # Загрузка отменена остановкой - не считается ошибкой
+                                if result.status == DownloadStatus.SKIPPED:
+                                    continue
+                                
+                                if result.status == DownloadStatus.SUCCESS:
+                                    # Запоминаем загруженный мод для возможного удаления в режиме 2
+                                    downloaded_mods.append(workshop_id)
+                                    
+                                    if mod_info:
+                                        mod_slots[i] = mod_info
+                                        
+                                        # Сохранение в базу данных
+                                        db_rows.append(
+                                            (workshop_id, mod_info.package_id, self.collection_url)
+                                        )
+                                        
+                                        processed += 1
+                                        self.log(
+                                            f"Обработан мод {workshop_id}: {mod_info.package_id}",
+                                            "SUCCESS"
+                                        )
+                                    else:
+                                        errors += 1
+                                        self.log(
+                                            f"Не удалось извлечь packageId для мода {workshop_id}",
+                                            "WARNING"
+                                        )
+                                else:
+                                    errors += 1
+                                    self.log(
+                                        f"Ошибка загрузки мода {workshop_id}: {result.error_message}",
+                                        "ERROR"
+                                    )
+                                
+                                self._emit_state(completed, total_mods, processed, skipped, errors)
                 
-                self.stats_signal.emit(processed, skipped, errors)
+                # Итоговое состояние отправляется всегда
+                self._emit_state(completed, total_mods, processed, skipped, errors, force=True)
+                
+                if self._stop_event.is_set():
+                    self.log("Обработка остановлена пользователем", "WARNING")
+            finally:
+                # Сохранение накопленных записей, в том числе при остановке
+                # или ошибке - уже загруженные моды не будут скачаны повторно
+                if db_rows:
+                    # synchronous=OFF включается только на время самой записи,
+                    # а не на всё время загрузки модов
+                    with db.bulk_import():
+                        db.add_mods(db_rows)
+            
+            # Список успешно обработанных модов в порядке коллекции
+            mod_infos: List[ModInfo] = [m for m in mod_slots if m is not None]
             
             # Генерация XML
             xml_generation_success = False
             result_path = ""
             
-            if mod_infos and not self._stop_requested:
+            if mod_infos and not self._stop_event.is_set():
                 self.log(f"Генерация XML файла ({len(mod_infos)} модов)...", "INFO")
                 
                 # Генерация XML в формате ModsConfigData (RimWorld native)
-                xml_content = xml_processor.generate_mods_config_data_xml(
+                # с записью в файл по мере формирования строк
+                success, result_path = xml_processor.write_mods_config_data(
                     mod_infos,
+                    self.output_path,
+                    self.xml_filename,
                     version="1.6.4633",
                     include_workshop_ids=self.include_workshop_ids
                 )
                 
-                success, result_path = xml_processor.save_xml(
-                    xml_content,
-                    self.output_path,
-                    self.xml_filename
-                )
-                
                 if success:
                     self.log(f"XML файл сохранён: {result_path}", "SUCCESS")
                     xml_generation_success = True
                 else:
                     self.log(f"Ошибка сохранения XML: {result_path}", "ERROR")
-            elif self._stop_requested:
+            elif self._stop_event.is_set():
                 self.log("Обработка была остановлена пользователем", "WARNING")
             else:
                 self.log("Не удалось обработать ни одного мода", "WARNING")
@@ -268,7 +490,7 @@ class WorkerThread(QThread):
                     f"Ошибок: {errors}\n"
                     f"Файл: {result_path}"
                 )
-            elif self._stop_requested:
+            elif self._stop_event.is_set():
                 self.finished_signal.emit(False, "Обработка была остановлена")
             else:
                 self.finished_signal.emit(False, "Не удалось обработать ни одного мода")
@@ -276,6 +498,61 @@ class WorkerThread(QThread):
         except Exception as e:
             self.log(f"Критическая ошибка: {str(e)}", "ERROR")
             self.finished_signal.emit(False, f"Критическая ошибка: {str(e)}")
+        finally:
+            if db is not None:
+                db.close()
+    
+    def _download_and_extract(
+        self,
+        workshop_ids: List[str],
+        xml_processor: XmlProcessor
+    ) -> List[Tuple[DownloadResult, Optional[ModInfo]]]:
+        """
+        Загрузка пачки модов и извлечение их packageId.
+        
+        Выполняется в пуле потоков, чтобы разбор About.xml одной пачки
+        шёл параллельно с загрузкой остальных.
+        
+        Args:
+            workshop_ids: ID модов в Steam Workshop
+            xml_processor: Обработчик XML
+            
+        Returns:
+            Пары (результат загрузки, информация о моде или None)
+            в порядке workshop_ids
+        """
+        pairs = []
+        for result in self.steam_handler.download_mods_batch(workshop_ids):
+            mod_info = None
+            if result.status == DownloadStatus.SUCCESS:
+                mod_info = xml_processor.extract_package_id(
+                    result.mod_path, result.workshop_id
+                )
+            pairs.append((result, mod_info))
+        
+        return pairs
+    
+    @staticmethod
+    def _iter_mod_files(mod_path: str) -> Iterator[str]:
+        """
+        Ленивый обход файлов мода.
+        
+        Args:
+            mod_path: Путь к папке мода
+            
+        Yields:
+            Пути файлов относительно папки мода
+        """
+        stack = [("", mod_path)]
+        while stack:
+            rel_dir, abs_dir = stack.pop()
+            with os.scandir(abs_dir) as entries:
+                for entry in entries:
+                    rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((rel_path, entry.path))
+                    else:
+                        yield rel_path
     
     def _cleanup_downloaded_mods(self, downloaded_mods: List[str], processed_count: int) -> None:
         """
@@ -303,22 +580,22 @@ class WorkerThread(QThread):
                 self.log(f"  Путь: {mod_path}", "DEBUG")
                 
                 try:
-                    # Получаем список файлов для логирования
-                    files_to_delete = []
-                    for root, dirs, files in os.walk(mod_path):
-                        for file in files:
-                            full_path = os.path.join(root, file)
-                            files_to_delete.append(os.path.relpath(full_path, mod_path))
-                    
-                    if files_to_delete:
-                        self.log(f"  Файлы для удаления ({len(files_to_delete)}):", "DEBUG")
-                        for rel_path in files_to_delete[:5]:  # Показываем первые 5
-                            self.log(f"    - {rel_path}", "DEBUG")
-                        if len(files_to_delete) > 5:
-                            self.log(f"    ... и ещё {len(files_to_delete) - 5} файлов", "DEBUG")
+                    # Список файлов выводится только при расширенном логировании;
+                    # обход останавливается на шестом файле, остальные лишь считаются
+                    if self.verbose:
+                        files_iter = self._iter_mod_files(mod_path)
+                        sample = list(islice(files_iter, 6))
+                        
+                        if sample:
+                            total_files = len(sample) + sum(1 for _ in files_iter)
+                            self.log(f"  Файлы для удаления ({total_files}):", "DEBUG")
+                            for rel_path in sample[:5]:  # Показываем первые 5
+                                self.log(f"    - {rel_path}", "DEBUG")
+                            if total_files > 5:
+                                self.log(f"    ... и ещё {total_files - 5} файлов", "DEBUG")
                     
-                    # Удаляем мод
-                    if self.steam_handler.delete_mod(workshop_id):
+                    # Удаляем мод (папка переносится в корзину, файлы удаляются в фоне)
+                    if self.steam_handler.delete_mod(workshop_id, background=True):
                         self.log(f"Мод {workshop_id} успешно удалён", "SUCCESS")
                         deleted_count += 1
                     else:
@@ -332,6 +609,9 @@ class WorkerThread(QThread):
                 self.log(f"Мод {workshop_id} не найден для удаления (уже удалён?)", "DEBUG")
                 deleted_count += 1  # Считаем как удалённый
         
+        # Физическое удаление файлов не задерживает завершение обработки
+        self.steam_handler.purge_trash()
+        
         self.log("=" * 50, "INFO")
         self.log("УДАЛЕНИЕ МОДОВ ЗАВЕРШЕНО", "INFO")
         self.log(f"  Удалено: {deleted_count}", "SUCCESS")
@@ -354,6 +634,37 @@ class MainWindow(QMainWindow):
         
         # Рабочий поток
         self.worker: Optional[WorkerThread] = None
+        # Коллекция из кэша используется только для повтора после ошибки
+        # или остановки; после успешной обработки запуск читает её из Steam
+        # заново, чтобы учесть изменения коллекции
+        self._refresh_collection = True
+        
+        # Очередь сообщений лога (html, текст), сбрасываемая в виджет пачками
+        self._log_queue: deque = deque()
+        # Текст выведенных строк для копирования, с тем же ограничением,
+        # что и панель логов - без обхода документа виджета
+        self._log_plain: deque = deque(maxlen=self.settings.log_max_blocks)
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(UI_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_logs)
+        
+        # Последние значения прогресса и статистики, ожидающие отрисовки
+        self._pending_progress: Optional[tuple[int, int]] = None
+        self._pending_stats: Optional[tuple[int, int, int]] = None
+        self._shown_progress: Optional[tuple[int, int]] = None
+        self._shown_stats: Optional[tuple[int, int, int]] = None
+        self._ui_flush_timer = QTimer(self)
+        self._ui_flush_timer.setSingleShot(True)
+        self._ui_flush_timer.setInterval(UI_FLUSH_INTERVAL_MS)
+        self._ui_flush_timer.timeout.connect(self._flush_ui)
+        
+        # Смена шрифта перекладывает весь документ логов - при прокрутке
+        # спинбокса применяется только итоговое значение
+        self._font_size_timer = QTimer(self)
+        self._font_size_timer.setSingleShot(True)
+        self._font_size_timer.setInterval(LOG_FONT_APPLY_DELAY_MS)
+        self._font_size_timer.timeout.connect(self._apply_log_font_size)
         
         # Настройка окна
         self.setWindowTitle("RimWorld Mod Collector")
@@ -371,6 +682,31 @@ class MainWindow(QMainWindow):
         
         # Загрузка сохранённых настроек
         self._load_settings()
+        
+        # Автосохранение настроек: серия изменений (ввод пути, щелчки по
+        # размеру шрифта) записывается на диск один раз после паузы
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SETTINGS_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._save_settings)
+        self._connect_settings_autosave()
+    
+    def _connect_settings_autosave(self) -> None:
+        """Подключение изменений полей настроек к отложенному сохранению."""
+        for line_edit in (
+            self.steamcmd_input, self.output_path_input, self.filename_input,
+            self.collection_input, self.mods_path_input, self.temp_path_input
+        ):
+            line_edit.textChanged.connect(self._schedule_save_settings)
+        
+        self.mode1_radio.toggled.connect(self._schedule_save_settings)
+        self.font_size_spin.valueChanged.connect(self._schedule_save_settings)
+        self.log_max_blocks_spin.valueChanged.connect(self._schedule_save_settings)
+        self.verbose_checkbox.toggled.connect(self._schedule_save_settings)
+    
+    def _schedule_save_settings(self, *_args) -> None:
+        """Отложить сохранение настроек; повторный вызов переносит срок."""
+        self._save_timer.start()
     
     def _create_ui(self) -> None:
         """Создание пользовательского интерфейса."""
@@ -401,6 +737,48 @@ class MainWindow(QMainWindow):
         
         main_layout.addWidget(splitter)
     
+    @staticmethod
+    def _add_path_row(
+        row: QHBoxLayout,
+        placeholder: str,
+        on_browse,
+        label: Optional[str] = None
+    ) -> QLineEdit:
+        """
+        Заполнение строки выбора пути: подпись, поле ввода и кнопка обзора.
+        
+        Строки с подписью используют компактную кнопку "📁",
+        без подписи - кнопку "📁 Обзор".
+        
+        Args:
+            row: Горизонтальный layout строки
+            placeholder: Текст-подсказка поля ввода
+            on_browse: Обработчик нажатия кнопки обзора
+            label: Подпись слева от поля (опционально)
+            
+        Returns:
+            Созданное поле ввода
+        """
+        if label is not None:
+            path_label = QLabel(label)
+            path_label.setFixedWidth(100)
+            row.addWidget(path_label)
+        
+        path_input = QLineEdit()
+        path_input.setPlaceholderText(placeholder)
+        row.addWidget(path_input)
+        
+        if label is not None:
+            browse_btn = QPushButton("📁")
+            browse_btn.setFixedWidth(40)
+        else:
+            browse_btn = QPushButton("📁 Обзор")
+            browse_btn.setFixedWidth(100)
+        browse_btn.clicked.connect(on_browse)
+        row.addWidget(browse_btn)
+        
+        return path_input
+    
     def _create_left_panel(self) -> QWidget:
         """Создание левой панели с настройками."""
         panel = QWidget()
@@ -436,15 +814,9 @@ class MainWindow(QMainWindow):
         
         # Путь сохранения
         path_layout = QHBoxLayout()
-        self.output_path_input = QLineEdit()
-        self.output_path_input.setPlaceholderText("Путь для сохранения XML файла...")
-        path_layout.addWidget(self.output_path_input)
-        
-        browse_btn = QPushButton("📁 Обзор")
-        browse_btn.clicked.connect(self._browse_output_path)
-        browse_btn.setFixedWidth(100)
-        path_layout.addWidget(browse_btn)
-        
+        self.output_path_input = self._add_path_row(
+            path_layout, "Путь для сохранения XML файла...", self._browse_output_path
+        )
         output_layout.addLayout(path_layout)
         
         # Имя файла
@@ -464,15 +836,9 @@ class MainWindow(QMainWindow):
         # Группа: SteamCMD
         steamcmd_group = QGroupBox("⚙️ SteamCMD")
         steamcmd_layout = QHBoxLayout(steamcmd_group)
-        
-        self.steamcmd_input = QLineEdit()
-        self.steamcmd_input.setPlaceholderText("Путь к steamcmd.exe...")
-        steamcmd_layout.addWidget(self.steamcmd_input)
-        
-        steamcmd_browse_btn = QPushButton("📁 Обзор")
-        steamcmd_browse_btn.clicked.connect(self._browse_steamcmd)
-        steamcmd_browse_btn.setFixedWidth(100)
-        steamcmd_layout.addWidget(steamcmd_browse_btn)
+        self.steamcmd_input = self._add_path_row(
+            steamcmd_layout, "Путь к steamcmd.exe...", self._browse_steamcmd
+        )
         
         layout.addWidget(steamcmd_group)
         
@@ -492,19 +858,12 @@ class MainWindow(QMainWindow):
         
         # Папка для постоянного хранения модов (Режим 1)
         mode1_path_layout = QHBoxLayout()
-        mode1_path_label = QLabel("  Папка модов:")
-        mode1_path_label.setFixedWidth(100)
-        mode1_path_layout.addWidget(mode1_path_label)
-        
-        self.mods_path_input = QLineEdit()
-        self.mods_path_input.setPlaceholderText("Папка для постоянного хранения модов...")
-        mode1_path_layout.addWidget(self.mods_path_input)
-        
-        mods_path_browse_btn = QPushButton("📁")
-        mods_path_browse_btn.clicked.connect(self._browse_mods_path)
-        mods_path_browse_btn.setFixedWidth(40)
-        mode1_path_layout.addWidget(mods_path_browse_btn)
-        
+        self.mods_path_input = self._add_path_row(
+            mode1_path_layout,
+            "Папка для постоянного хранения модов...",
+            self._browse_mods_path,
+            label="  Папка модов:"
+        )
         mode_layout.addLayout(mode1_path_layout)
         
         # Режим 2
@@ -516,24 +875,18 @@ class MainWindow(QMainWindow):
         
         # Временная папка для загрузки (Режим 2)
         mode2_path_layout = QHBoxLayout()
-        mode2_path_label = QLabel("  Временная папка:")
-        mode2_path_label.setFixedWidth(100)
-        mode2_path_layout.addWidget(mode2_path_label)
-        
-        self.temp_path_input = QLineEdit()
-        self.temp_path_input.setPlaceholderText("Временная папка для загрузки модов...")
-        mode2_path_layout.addWidget(self.temp_path_input)
-        
-        temp_path_browse_btn = QPushButton("📁")
-        temp_path_browse_btn.clicked.connect(self._browse_temp_path)
-        temp_path_browse_btn.setFixedWidth(40)
-        mode2_path_layout.addWidget(temp_path_browse_btn)
-        
+        self.temp_path_input = self._add_path_row(
+            mode2_path_layout,
+            "Временная папка для загрузки модов...",
+            self._browse_temp_path,
+            label="  Временная папка:"
+        )
         mode_layout.addLayout(mode2_path_layout)
         
-        # Подключение сигналов для обновления состояния полей
+        # Подключение сигналов для обновления состояния полей.
+        # Кнопок в группе две, поэтому mode1_radio переключается при любой
+        # смене режима и второго подключения не требуется.
         self.mode1_radio.toggled.connect(self._update_path_fields_state)
-        self.mode2_radio.toggled.connect(self._update_path_fields_state)
         
         layout.addWidget(mode_group)
         
@@ -611,12 +964,33 @@ class MainWindow(QMainWindow):
         self.font_size_spin.setFixedWidth(60)
         header_layout.addWidget(self.font_size_spin)
         
+        # Ограничение истории: старые строки удаляются, и память и стоимость
+        # вставки не растут с длительностью работы
+        max_blocks_label = QLabel("Строк:")
+        max_blocks_label.setStyleSheet(f"color: {COLORS['text_secondary']};")
+        header_layout.addWidget(max_blocks_label)
+        
+        self.log_max_blocks_spin = QSpinBox()
+        self.log_max_blocks_spin.setRange(LOG_MAX_BLOCKS_MIN, LOG_MAX_BLOCKS_MAX)
+        self.log_max_blocks_spin.setSingleStep(500)
+        # Значение применяется после ввода (Enter или потеря фокуса): при
+        # наборе промежуточные числа (2000 на пути к 20000) обрезали бы
+        # историю безвозвратно
+        self.log_max_blocks_spin.setKeyboardTracking(False)
+        self.log_max_blocks_spin.setValue(self.settings.log_max_blocks)
+        self.log_max_blocks_spin.valueChanged.connect(self._update_log_max_blocks)
+        self.log_max_blocks_spin.setFixedWidth(80)
+        header_layout.addWidget(self.log_max_blocks_spin)
+        
         layout.addLayout(header_layout)
         
-        # Текстовое поле логов
-        self.log_text = QTextEdit()
+        # Текстовое поле логов: QPlainTextEdit добавляет строку без
+        # перекладки всего документа, каждая строка - отдельный блок
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
-        self.log_text.setFont(QFont("Consolas", self.settings.log_font_size))
+        self.log_text.setMaximumBlockCount(self.settings.log_max_blocks)
+        self.log_text.document().setDefaultStyleSheet(LOG_DOCUMENT_STYLESHEET)
+        self.log_text.setFont(_log_font(self.settings.log_font_size))
         layout.addWidget(self.log_text)
         
         # Кнопки управления логами
@@ -656,6 +1030,7 @@ class MainWindow(QMainWindow):
             self.mode2_radio.setChecked(True)
         
         self.font_size_spin.setValue(self.settings.log_font_size)
+        self.log_max_blocks_spin.setValue(self.settings.log_max_blocks)
         self.verbose_checkbox.setChecked(self.settings.verbose_logging)
         
         # Обновление состояния полей путей
@@ -663,6 +1038,9 @@ class MainWindow(QMainWindow):
     
     def _save_settings(self) -> None:
         """Сохранение текущих настроек."""
+        # Немедленное сохранение отменяет отложенное
+        self._save_timer.stop()
+        
         self.settings.steamcmd_path = self.steamcmd_input.text()
         self.settings.output_path = self.output_path_input.text()
         self.settings.xml_filename = self.filename_input.text() or "ModList"
@@ -678,6 +1056,7 @@ class MainWindow(QMainWindow):
             self.settings.work_mode = WorkMode.TEMPORARY
         
         self.settings.log_font_size = self.font_size_spin.value()
+        self.settings.log_max_blocks = self.log_max_blocks_spin.value()
         self.settings.verbose_logging = self.verbose_checkbox.isChecked()
         
         # Сохранение размеров окна
@@ -738,9 +1117,9 @@ class MainWindow(QMainWindow):
         # Визуальное выделение активного поля
         if mode1_selected:
             self.mods_path_input.setStyleSheet("")
-            self.temp_path_input.setStyleSheet(f"color: {COLORS['text_muted']};")
+            self.temp_path_input.setStyleSheet(_MUTED_INPUT_STYLE)
         else:
-            self.mods_path_input.setStyleSheet(f"color: {COLORS['text_muted']};")
+            self.mods_path_input.setStyleSheet(_MUTED_INPUT_STYLE)
             self.temp_path_input.setStyleSheet("")
     
     def _get_current_download_path(self) -> str:
@@ -751,35 +1130,97 @@ class MainWindow(QMainWindow):
             return self.temp_path_input.text().strip()
     
     def _log(self, message: str, level: str = "INFO") -> None:
-        """Добавление сообщения в лог."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        html = get_log_html_style(level, message, timestamp)
+        """
+        Добавление сообщения в лог.
+        
+        Сообщение ставится в очередь и выводится вместе с остальными
+        при ближайшем срабатывании таймера, чтобы поток логов от воркера
+        не вызывал перерисовку виджета на каждую строку.
+        """
+        timestamp = _log_timestamp()
+        self._log_queue.append((
+            get_log_html_style(level, message, timestamp, line_break=False),
+            get_log_plain_text(level, message, timestamp)
+        ))
+        
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+    
+    def _take_worker_logs(self) -> None:
+        """Перенос накопленных сообщений рабочего потока в очередь лога."""
+        worker = self.sender()
+        if worker is None:
+            return
+        self._log_queue.extend(worker.take_logs())
         
-        self.log_text.moveCursor(QTextCursor.MoveOperation.End)
-        self.log_text.insertHtml(html)
-        self.log_text.moveCursor(QTextCursor.MoveOperation.End)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+    
+    def _flush_logs(self) -> None:
+        """Вывод накопленных сообщений лога одной вставкой."""
+        if not self._log_queue:
+            return
+        
+        # Строки сверх ограничения панели всё равно были бы сразу удалены -
+        # при всплеске сообщений выводится только хвост очереди
+        # (ограничение 0 означает, что строки не удаляются)
+        queue = self._log_queue
+        max_blocks = self.log_text.maximumBlockCount()
+        skip = len(queue) - max_blocks if max_blocks > 0 else 0
+        lines = islice(queue, skip, None) if skip > 0 else queue
+        
+        # appendHtml() сам прокручивает вниз, только если пользователь
+        # не листает историю. Общий блок правки откладывает обновление
+        # раскладки документа до конца пачки, а не выполняет его на каждую строку
+        append_html = self.log_text.appendHtml
+        append_plain = self._log_plain.append
+        cursor = QTextCursor(self.log_text.document())
+        cursor.beginEditBlock()
+        try:
+            for html, plain in lines:
+                append_html(html)
+                append_plain(plain)
+        finally:
+            cursor.endEditBlock()
+        queue.clear()
     
     def _clear_logs(self) -> None:
         """Очистка логов."""
+        self._log_queue.clear()
+        self._log_plain.clear()
         self.log_text.clear()
     
     def _copy_logs(self) -> None:
         """Копирование логов в буфер обмена."""
+        self._flush_logs()
         clipboard = QApplication.clipboard()
-        clipboard.setText(self.log_text.toPlainText())
+        clipboard.setText("\n".join(self._log_plain))
         self._log("Логи скопированы в буфер обмена", "INFO")
     
-    def _update_log_font_size(self, size: int) -> None:
-        """Обновление размера шрифта логов."""
-        font = self.log_text.font()
-        font.setPointSize(size)
-        self.log_text.setFont(font)
+    def _update_log_font_size(self, _size: int) -> None:
+        """Отложенное обновление размера шрифта логов."""
+        self._font_size_timer.start()
+    
+    def _apply_log_font_size(self) -> None:
+        """Применение размера шрифта логов, если он изменился."""
+        size = self.font_size_spin.value()
+        if self.log_text.font().pointSize() == size:
+            return
+        self.log_text.setFont(_log_font(size))
+    
+    def _update_log_max_blocks(self, count: int) -> None:
+        """Обновление ограничения числа строк в панели логов."""
+        if self.log_text.maximumBlockCount() == count:
+            return
+        self.log_text.setMaximumBlockCount(count)
+        self._log_plain = deque(self._log_plain, maxlen=count)
     
     def _open_output_folder(self) -> None:
         """Открытие папки с результатами."""
         path = self.output_path_input.text()
         if path and os.path.exists(path):
-            os.startfile(path) if os.name == 'nt' else os.system(f'xdg-open "{path}"')
+            # Открытие средствами платформы, без запуска оболочки
+            QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath(path)))
         else:
             QMessageBox.warning(
                 self,
@@ -788,16 +1229,19 @@ class MainWindow(QMainWindow):
             )
     
     def _validate_inputs(self) -> tuple[bool, str]:
-        """Проверка введённых данных."""
+        """
+        Проверка введённых данных.
+        
+        Проверяется только заполненность полей: наличие steamcmd на диске
+        проверяет рабочий поток первым шагом (validate_steamcmd), чтобы
+        медленный или сетевой диск не блокировал интерфейс.
+        """
         if not self.collection_input.text().strip():
             return False, "Введите ссылку на коллекцию Steam Workshop"
         
         if not self.steamcmd_input.text().strip():
             return False, "Укажите путь к steamcmd"
         
-        if not os.path.exists(self.steamcmd_input.text()):
-            return False, "Файл steamcmd не найден"
-        
         if not self.output_path_input.text().strip():
             return False, "Укажите путь для сохранения XML"
         
@@ -820,9 +1264,6 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Ошибка", error)
             return
         
-        # Сохранение настроек
-        self._save_settings()
-        
         # Определение режима работы
         work_mode = WorkMode.PERSISTENT if self.mode1_radio.isChecked() else WorkMode.TEMPORARY
         
@@ -838,11 +1279,13 @@ class MainWindow(QMainWindow):
             work_mode=work_mode,
             download_path=download_path,
             include_workshop_ids=True,
-            verbose=self.verbose_checkbox.isChecked()
+            verbose=self.verbose_checkbox.isChecked(),
+            download_timeout=self.settings.settings.download_timeout,
+            refresh_collection=self._refresh_collection
         )
         
         # Подключение сигналов
-        self.worker.log_signal.connect(self._log)
+        self.worker.logs_ready_signal.connect(self._take_worker_logs)
         self.worker.progress_signal.connect(self._update_progress)
         self.worker.finished_signal.connect(self._on_processing_finished)
         self.worker.stats_signal.connect(self._update_stats)
@@ -850,7 +1293,12 @@ class MainWindow(QMainWindow):
         # Обновление UI
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
+        self._pending_progress = None
+        self._pending_stats = None
+        self._shown_progress = None
+        self._shown_stats = None
         self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%v / %m модов")
         
         # Запуск
         self.worker.start()
@@ -863,27 +1311,50 @@ class MainWindow(QMainWindow):
             self._log("Запрос на остановку отправлен...", "WARNING")
     
     def _update_progress(self, current: int, total: int) -> None:
-        """Обновление прогресс-бара."""
-        self.progress_bar.setMaximum(total)
-        self.progress_bar.setValue(current)
-        self.progress_bar.setFormat(f"{current} / {total} модов")
+        """Запоминание прогресса до ближайшего обновления UI."""
+        self._pending_progress = (current, total)
+        if not self._ui_flush_timer.isActive():
+            self._ui_flush_timer.start()
     
     def _update_stats(self, processed: int, skipped: int, errors: int) -> None:
-        """Обновление статистики."""
-        self.stats_label.setText(
-            f"Обработано: {processed} | Пропущено: {skipped} | Ошибок: {errors}"
-        )
+        """Запоминание статистики до ближайшего обновления UI."""
+        self._pending_stats = (processed, skipped, errors)
+        if not self._ui_flush_timer.isActive():
+            self._ui_flush_timer.start()
+    
+    def _flush_ui(self) -> None:
+        """Применение последних значений прогресса и статистики."""
+        # Виджеты обновляются только при изменении отображаемых значений
+        progress, self._pending_progress = self._pending_progress, None
+        if progress is not None and progress != self._shown_progress:
+            current, total = progress
+            if total != self.progress_bar.maximum():
+                self.progress_bar.setMaximum(total)
+            self.progress_bar.setValue(current)
+            self._shown_progress = progress
+        
+        stats, self._pending_stats = self._pending_stats, None
+        if stats is not None and stats != self._shown_stats:
+            processed, skipped, errors = stats
+            self.stats_label.setText(
+                f"Обработано: {processed} | Пропущено: {skipped} | Ошибок: {errors}"
+            )
+            self._shown_stats = stats
     
     def _on_processing_finished(self, success: bool, message: str) -> None:
         """Обработка завершения работы."""
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
+        self._flush_ui()
+        self._refresh_collection = success
         
         if success:
             self._log("Обработка успешно завершена!", "SUCCESS")
+            self._flush_logs()
             QMessageBox.information(self, "Готово", message)
         else:
             self._log(f"Обработка завершена с ошибкой: {message}", "ERROR")
+            self._flush_logs()
             QMessageBox.warning(self, "Ошибка", message)
     
     def closeEvent(self, event) -> None:
@@ -5,10 +5,23 @@
 
 import os
 import json
+from operator import attrgetter
 from typing import Optional, Any
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 
+# orjson (необязательная зависимость) - быстрее стандартного json
+# при чтении и записи настроек
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Допустимый диапазон ограничения строк в панели логов
+LOG_MAX_BLOCKS_MIN = 500
+LOG_MAX_BLOCKS_MAX = 100000
+
 
 class WorkMode(Enum):
     """Режим работы приложения."""
@@ -33,6 +46,7 @@ class AppSettings:
     
     # Настройки интерфейса
     log_font_size: int = 10
+    log_max_blocks: int = 5000  # Максимум строк в панели логов
     window_width: int = 1200
     window_height: int = 700
     
@@ -54,6 +68,37 @@ class AppSettings:
         self.work_mode = mode.value
 
 
+# Имена полей AppSettings: кортеж задаёт порядок ключей в JSON,
+# множество - для проверки ключей из файла
+_APP_SETTINGS_FIELD_NAMES = tuple(f.name for f in fields(AppSettings))
+_APP_SETTINGS_FIELDS = frozenset(_APP_SETTINGS_FIELD_NAMES)
+_get_app_settings_values = attrgetter(*_APP_SETTINGS_FIELD_NAMES)
+
+
+def _settings_to_dict(settings: AppSettings) -> dict:
+    """
+    Словарь значений настроек.
+    
+    Все поля AppSettings - простые значения, поэтому вместо asdict()
+    с его рекурсивным копированием достаточно одного attrgetter.
+    """
+    return dict(zip(_APP_SETTINGS_FIELD_NAMES, _get_app_settings_values(settings)))
+
+
+def _dumps_json(data: Any) -> bytes:
+    """Сериализовать данные в JSON (UTF-8, отступ 2 пробела)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _loads_json(raw: bytes) -> Any:
+    """Разобрать JSON из байтов."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 class SettingsManager:
     """
     Менеджер настроек приложения.
@@ -78,6 +123,11 @@ class SettingsManager:
             self.settings_path = os.path.join(app_dir, self.DEFAULT_SETTINGS_FILE)
         
         self.settings = AppSettings()
+        # Снимок настроек в том виде, в каком они лежат в файле; None - файл
+        # ещё не записывался и не читался. Часть полей меняется напрямую
+        # через self.settings, поэтому изменения определяются сравнением
+        # со снимком, а не флагом в сеттерах
+        self._saved_data: Optional[dict] = None
         self._load_settings()
     
     def _load_settings(self) -> None:
@@ -87,13 +137,22 @@ class SettingsManager:
             return
         
         try:
-            with open(self.settings_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(self.settings_path, 'rb') as f:
+                data = _loads_json(f.read())
             
             # Обновление настроек из загруженных данных
             for key, value in data.items():
-                if hasattr(self.settings, key):
+                if key in _APP_SETTINGS_FIELDS:
                     setattr(self.settings, key, value)
+            
+            # Значения из файла проходят те же ограничения, что и при
+            # изменении через свойства
+            self.log_max_blocks = self.settings.log_max_blocks
+            
+            # Файл содержит ровно эти значения - до первого изменения
+            # сохранять нечего
+            if _settings_to_dict(self.settings) == data:
+                self._saved_data = data
                     
         except json.JSONDecodeError:
             # Файл повреждён, используем настройки по умолчанию
@@ -102,23 +161,44 @@ class SettingsManager:
             # Другие ошибки, используем настройки по умолчанию
             pass
     
+    @property
+    def is_dirty(self) -> bool:
+        """Есть ли изменения, не записанные в файл."""
+        return _settings_to_dict(self.settings) != self._saved_data
+    
     def save_settings(self) -> bool:
         """
         Сохранить настройки в файл.
         
+        Если настройки не менялись с последней загрузки или сохранения,
+        файл не перезаписывается.
+        
         Returns:
             True если сохранение успешно, False при ошибке.
         """
+        data = _settings_to_dict(self.settings)
+        if data == self._saved_data:
+            return True
+        
         try:
             # Создание директории если не существует
             os.makedirs(os.path.dirname(self.settings_path), exist_ok=True)
             
-            with open(self.settings_path, 'w', encoding='utf-8') as f:
-                json.dump(asdict(self.settings), f, indent=2, ensure_ascii=False)
+            # Запись во временный файл и атомарная подмена: прерванная
+            # запись не оставляет повреждённый settings.json
+            tmp_path = self.settings_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps_json(data))
+            os.replace(tmp_path, self.settings_path)
             
+            self._saved_data = data
             return True
             
         except Exception:
+            try:
+                os.remove(self.settings_path + ".tmp")
+            except OSError:
+                pass
             return False
     
     def get(self, key: str, default: Any = None) -> Any:
@@ -145,8 +225,13 @@ class SettingsManager:
         Returns:
             True если настройка установлена, False если ключ не существует.
         """
-        if hasattr(self.settings, key):
-            setattr(self.settings, key, value)
+        if key == "log_max_blocks":
+            # Значение с ограничениями проходит проверку свойства
+            self.log_max_blocks = value
+            return True
+        if key in _APP_SETTINGS_FIELDS:
+            if getattr(self.settings, key) != value:
+                setattr(self.settings, key, value)
             return True
         return False
     
@@ -175,8 +260,8 @@ class SettingsManager:
             True если экспорт успешен.
         """
         try:
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(asdict(self.settings), f, indent=2, ensure_ascii=False)
+            with open(export_path, 'wb') as f:
+                f.write(_dumps_json(_settings_to_dict(self.settings)))
             return True
         except Exception:
             return False
@@ -192,12 +277,12 @@ class SettingsManager:
             True если импорт успешен.
         """
         try:
-            with open(import_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(import_path, 'rb') as f:
+                data = _loads_json(f.read())
             
+            # set() пропускает неизвестные ключи и совпадающие значения
             for key, value in data.items():
-                if hasattr(self.settings, key):
-                    setattr(self.settings, key, value)
+                self.set(key, value)
             
             return True
         except Exception:
@@ -250,6 +335,19 @@ class SettingsManager:
     def log_font_size(self, value: int) -> None:
         self.settings.log_font_size = max(8, min(24, value))  # Ограничение 8-24
     
+    @property
+    def log_max_blocks(self) -> int:
+        """Максимальное число строк в панели логов."""
+        return self.settings.log_max_blocks
+    
+    @log_max_blocks.setter
+    def log_max_blocks(self, value: int) -> None:
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = AppSettings.log_max_blocks
+        self.settings.log_max_blocks = max(LOG_MAX_BLOCKS_MIN, min(LOG_MAX_BLOCKS_MAX, value))
+    
     @property
     def verbose_logging(self) -> bool:
         """Расширенное логирование."""
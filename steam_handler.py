@@ -9,10 +9,10 @@ import re
 import subprocess
 import shutil
 import tempfile
-from typing import Optional, List, Callable, Tuple
+import threading
+from typing import Optional, List, Callable, Tuple, Dict, Iterable
 from dataclasses import dataclass
 from enum import Enum
-from pathlib import Path
 import time
 
 
@@ -22,6 +22,128 @@ RIMWORLD_APP_ID = "294100"
 # Таймауты
 DEFAULT_DOWNLOAD_TIMEOUT = 300  # 5 минут
 
+# Время жизни разобранной страницы коллекции в кэше (сек)
+COLLECTION_CACHE_TTL = 300
+
+# Максимальное число одновременно работающих процессов steamcmd
+MAX_PARALLEL_DOWNLOADS = 8
+
+# Максимальное число модов, загружаемых одним запуском steamcmd: запуск
+# процесса и вход в Steam выполняются один раз на пачку
+DOWNLOAD_BATCH_SIZE = 20
+
+# Интервал проверки флага остановки во время ожидания steamcmd (сек)
+PROCESS_POLL_INTERVAL = 0.5
+
+# steamcmd может завершиться с кодом 0, не загрузив мод (ограничение частоты
+# запросов, нехватка места) - такие загрузки повторяются с паузой 1, 2 сек
+DOWNLOAD_ATTEMPTS = 3
+DOWNLOAD_RETRY_DELAY = 1.0
+
+# Расположения About.xml, по которым проверяется завершённость загрузки
+ABOUT_XML_CANDIDATES = (
+    os.path.join("About", "About.xml"),
+    os.path.join("about", "About.xml"),
+    os.path.join("About", "about.xml"),
+    os.path.join("about", "about.xml"),
+    "About.xml",
+    "about.xml"
+)
+
+# HTTP-запросы к Steam
+HTTP_HEADERS = {
+    "User-Agent": "rimworld-modbridge/1.0",
+    "Accept-Encoding": "gzip, deflate"
+}
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.3  # пауза перед повтором: 0.3, 0.6, 1.2 сек
+
+# Параметры запуска steamcmd постоянны для платформы и вычисляются один раз.
+# Windows: скрыть консольное окно
+if os.name == 'nt':
+    _STARTUPINFO = subprocess.STARTUPINFO()
+    _STARTUPINFO.dwFlags = subprocess.STARTF_USESHOWWINDOW
+    _STARTUPINFO.wShowWindow = 0
+    _CREATIONFLAGS = subprocess.CREATE_NO_WINDOW
+else:
+    _STARTUPINFO = None
+    _CREATIONFLAGS = 0
+
+# Каталоги (относительно директории установки), в которых steamcmd может
+# оставить папку мода; порядок - от стандартной структуры к запасным.
+# Пути собраны заранее: для мода остаётся одно os.path.join
+_MOD_CONTENT_SUBDIR = os.path.join("steamapps", "workshop", "content", RIMWORLD_APP_ID)
+_MOD_LOCATIONS = (
+    _MOD_CONTENT_SUBDIR,
+    # downloads структура (где steamcmd реально создаёт файлы)
+    os.path.join("steamapps", "workshop", "downloads", RIMWORLD_APP_ID),
+    # Временная структура без steamapps
+    os.path.join("workshop", "content", RIMWORLD_APP_ID),
+    os.path.join("workshop", "downloads", RIMWORLD_APP_ID),
+    # Просто папка с ID в директории установки
+    "",
+)
+
+# Регулярные выражения компилируются один раз при импорте модуля
+# Паттерны для различных форматов URL коллекции
+_COLLECTION_URL_PATTERNS = [
+    re.compile(r'steamcommunity\.com/sharedfiles/filedetails/\?id=(\d+)'),
+    re.compile(r'steamcommunity\.com/workshop/filedetails/\?id=(\d+)'),
+    re.compile(r'^(\d+)$')  # Просто числовой ID
+]
+
+# Название коллекции на странице Workshop (по байтам страницы)
+_COLLECTION_TITLE_RE = re.compile(rb'<div class="workshopItemTitle">([^<]+)</div>')
+
+# Ссылки на моды коллекции
+_MOD_ID_RE = re.compile(r'sharedfiles/filedetails/\?id=(\d+)')
+_MOD_ID_RE_BYTES = re.compile(rb'sharedfiles/filedetails/\?id=(\d+)')
+
+# Быстрый поиск packageId в начале About.xml без разбора XML
+_PACKAGE_ID_RE = re.compile(
+    rb'<packageId[^>]*>\s*([^<\s][^<]*?)\s*</packageId>', re.IGNORECASE
+)
+# Теги перед найденным packageId (для проверки глубины вложенности)
+_XML_TAG_RE = re.compile(rb'<[^>]*>')
+# Объём начала файла для быстрого поиска
+PACKAGE_ID_SCAN_BYTES = 16384
+
+
+def _is_root_child_position(head: bytes, end: int) -> bool:
+    """
+    Проверить, что позиция end в начале XML находится внутри корня.
+    
+    Учитываются открывающие, закрывающие и самозакрывающиеся теги до end.
+    Комментарии, CDATA, DOCTYPE и теги с атрибутами в кавычках не
+    разбираются - для них возвращается False, и вызывающий код
+    переходит к полноценному разбору.
+    
+    Args:
+        head: Начало XML документа.
+        end: Позиция проверяемого тега.
+        
+    Returns:
+        True если перед позицией открыт ровно один элемент (корень).
+    """
+    # Незакрытый до end комментарий тегом не считается - проверяется отдельно
+    if head.find(b"<!", 0, end) != -1:
+        return False
+    
+    depth = 0
+    for match in _XML_TAG_RE.finditer(head, 0, end):
+        tag = match.group()
+        if tag.startswith(b"<?") and tag.endswith(b"?>"):
+            # Объявление XML и инструкции обработки на глубину не влияют
+            continue
+        if b'"' in tag or b"'" in tag:
+            return False
+        if tag.startswith(b"</"):
+            depth -= 1
+        elif not tag.endswith(b"/>"):
+            depth += 1
+    return depth == 1
+
 
 class DownloadStatus(Enum):
     """Статус загрузки мода."""
@@ -63,6 +185,12 @@ class CollectionParseError(Exception):
     pass
 
 
+# Разобранные коллекции: {collection_id: (время получения, CollectionInfo)}.
+# Кэш общий для модуля: GUI создаёт новый SteamHandler на каждый запуск
+# обработки, и повторный запуск той же коллекции берёт её отсюда
+_collection_cache: Dict[str, Tuple[float, CollectionInfo]] = {}
+
+
 class SteamHandler:
     """
     Класс для работы со Steam Workshop.
@@ -73,7 +201,8 @@ class SteamHandler:
         self,
         steamcmd_path: str,
         download_dir: Optional[str] = None,
-        log_callback: Optional[Callable[[str, str], None]] = None
+        log_callback: Optional[Callable[[str, str], None]] = None,
+        download_timeout: int = DEFAULT_DOWNLOAD_TIMEOUT
     ):
         """
         Инициализация обработчика Steam.
@@ -82,22 +211,32 @@ class SteamHandler:
             steamcmd_path: Путь к исполняемому файлу steamcmd.
             download_dir: Директория для загрузки модов.
             log_callback: Функция обратного вызова для логирования (message, level).
+            download_timeout: Максимальное время загрузки одного мода в секундах;
+                зависший steamcmd принудительно завершается.
         """
         self.steamcmd_path = steamcmd_path
         self._custom_download_dir = download_dir
         self.log_callback = log_callback
+        self.download_timeout = download_timeout
         self._stop_flag = None
-        self._current_process = None
         
-        # Путь к папке workshop (по умолчанию - Steam content)
-        self._workshop_path = Path.home() / "Steam/steamapps/workshop/content/294100"
+        # Запущенные процессы steamcmd (загрузки могут идти параллельно)
+        self._processes: set = set()
+        self._processes_lock = threading.Lock()
+        
+        # Путь к папке workshop (по умолчанию - Steam content); хранится
+        # строкой, так как download_dir читается на каждую загрузку
+        self._workshop_path = os.path.join(
+            os.path.expanduser("~"), "Steam", "steamapps", "workshop", "content", RIMWORLD_APP_ID
+        )
+        
+        # Папка content внутри download_dir: общий префикс путей модов
+        self._mod_content_dir = os.path.join(self.download_dir, _MOD_CONTENT_SUBDIR)
     
     @property
     def download_dir(self) -> str:
         """Получить директорию загрузки модов."""
-        if self._custom_download_dir:
-            return self._custom_download_dir
-        return str(self._workshop_path)
+        return self._custom_download_dir or self._workshop_path
     
     def _log(self, message: str, level: str = "INFO") -> None:
         """
@@ -143,24 +282,62 @@ class SteamHandler:
         Returns:
             Кортеж (валидность, ID коллекции или None).
         """
-        # Паттерны для различных форматов URL
-        patterns = [
-            r'steamcommunity\.com/sharedfiles/filedetails/\?id=(\d+)',
-            r'steamcommunity\.com/workshop/filedetails/\?id=(\d+)',
-            r'^(\d+)$'  # Просто числовой ID
-        ]
+        # Числовой ID коллекции проверяется без регулярных выражений
+        url = url.strip()
+        if url.isascii() and url.isdigit():
+            return True, url
         
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _COLLECTION_URL_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return True, match.group(1)
         
         return False, None
     
+    async def _fetch_page(self, session, url: str, timeout: int) -> bytes:
+        """
+        Загрузить страницу с повтором при временных ошибках Steam.
+        
+        Args:
+            session: Сессия aiohttp.
+            url: Адрес страницы.
+            timeout: Таймаут одного запроса в секундах.
+            
+        Returns:
+            Тело страницы без декодирования.
+            
+        Raises:
+            CollectionParseError: При ошибке HTTP.
+        """
+        import asyncio
+        import aiohttp
+        
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            retry = attempt < HTTP_MAX_RETRIES
+            try:
+                async with session.get(url, timeout=client_timeout) as response:
+                    if response.status == 200:
+                        # Страница не декодируется целиком: ID модов ищутся
+                        # по байтам, в UTF-8 декодируется только название
+                        return await response.read()
+                    if not (retry and response.status in HTTP_RETRY_STATUSES):
+                        raise CollectionParseError(f"Ошибка HTTP {response.status}")
+                    self._log(f"Steam ответил HTTP {response.status}, повтор запроса...", "DEBUG")
+            except aiohttp.ClientConnectionError:
+                if not retry:
+                    raise
+                self._log("Ошибка соединения со Steam, повтор запроса...", "DEBUG")
+            
+            await asyncio.sleep(HTTP_BACKOFF_FACTOR * (2 ** attempt))
+    
     async def fetch_collection_mods(
         self,
         collection_url: str,
-        timeout: int = 30
+        timeout: int = 30,
+        session=None,
+        force_refresh: bool = False
     ) -> CollectionInfo:
         """
         Получить список модов из коллекции Steam Workshop.
@@ -168,6 +345,11 @@ class SteamHandler:
         Args:
             collection_url: URL коллекции.
             timeout: Таймаут запроса в секундах.
+            session: Сессия aiohttp для повторного использования соединений
+                     между запросами (опционально). Если не указана,
+                     создаётся и закрывается собственная сессия.
+            force_refresh: Загрузить страницу заново, даже если коллекция
+                           есть в кэше (результат всё равно кэшируется).
             
         Returns:
             CollectionInfo с информацией о коллекции.
@@ -182,47 +364,139 @@ class SteamHandler:
         if not is_valid:
             raise CollectionParseError(f"Некорректный URL коллекции: {collection_url}")
         
+        cached = None if force_refresh else _collection_cache.get(collection_id)
+        if cached is not None:
+            age = time.monotonic() - cached[0]
+            if age < COLLECTION_CACHE_TTL:
+                self._log(
+                    f"Коллекция {collection_id} взята из кэша "
+                    f"(загружена {int(age)} сек назад)",
+                    "INFO"
+                )
+                return cached[1]
+        
         url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={collection_id}"
         
         self._log(f"Загрузка информации о коллекции {collection_id}...", "INFO")
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
-                    if response.status != 200:
-                        raise CollectionParseError(f"Ошибка HTTP {response.status}")
-                    
-                    html = await response.text()
-                    
-                    # Извлечение названия коллекции
-                    title_match = re.search(
-                        r'<div class="workshopItemTitle">([^<]+)</div>', 
-                        html
-                    )
-                    title = title_match.group(1) if title_match else None
-                    
-                    # Извлечение ID модов из коллекции
-                    mod_pattern = r'sharedfiles/filedetails/\?id=(\d+)'
-                    mod_ids = list(set(re.findall(mod_pattern, html)))
-                    
-                    # Исключаем ID самой коллекции
-                    mod_ids = [mid for mid in mod_ids if mid != collection_id]
-                    
-                    if not mod_ids:
-                        raise CollectionParseError("Не удалось найти моды в коллекции")
-                    
-                    self._log(f"Найдено {len(mod_ids)} модов", "SUCCESS")
-                    
-                    return CollectionInfo(
-                        collection_id=collection_id,
-                        title=title,
-                        mod_ids=mod_ids
-                    )
-                    
+            if session is not None:
+                html = await self._fetch_page(session, url, timeout)
+            else:
+                async with aiohttp.ClientSession(headers=HTTP_HEADERS) as own_session:
+                    html = await self._fetch_page(own_session, url, timeout)
         except asyncio.TimeoutError:
             raise CollectionParseError(f"Таймаут загрузки коллекции (>{timeout} сек)")
         except aiohttp.ClientError as e:
             raise CollectionParseError(f"Ошибка сети: {str(e)}")
+        
+        title, mod_ids = self._parse_collection_page(html, collection_id)
+        
+        if not mod_ids:
+            raise CollectionParseError("Не удалось найти моды в коллекции")
+        
+        self._log(f"Найдено {len(mod_ids)} модов", "SUCCESS")
+        
+        info = CollectionInfo(
+            collection_id=collection_id,
+            title=title,
+            mod_ids=mod_ids
+        )
+        now = time.monotonic()
+        # Устаревшие записи удаляются при добавлении новой, чтобы кэш
+        # не рос за долгую сессию
+        for key, (fetched_at, _) in list(_collection_cache.items()):
+            if now - fetched_at >= COLLECTION_CACHE_TTL:
+                _collection_cache.pop(key, None)
+        _collection_cache[collection_id] = (now, info)
+        return info
+    
+    @staticmethod
+    def _parse_collection_page(html: bytes, collection_id: str) -> Tuple[Optional[str], List[str]]:
+        """
+        Извлечь название коллекции и ID её модов из HTML страницы.
+        
+        При наличии lxml ссылки берутся только из элементов коллекции
+        (div.collectionItem), а не со всей страницы - ссылки на другие
+        предметы Workshop в описании и комментариях не попадают в список.
+        Без lxml или если в элементах коллекции не нашлось ни одного ID
+        (изменилась разметка) используются регулярные выражения по байтам
+        всей страницы.
+        
+        Args:
+            html: Тело страницы коллекции в UTF-8.
+            collection_id: ID самой коллекции (исключается из результата).
+            
+        Returns:
+            Кортеж (название или None, список ID модов в порядке страницы).
+        """
+        title = None
+        hrefs: List[str] = []
+        
+        try:
+            from lxml import html as lxml_html
+        except ImportError:
+            lxml_html = None
+        
+        if lxml_html is not None:
+            try:
+                # Кодировка задаётся явно: lxml не угадывает её по байтам
+                parser = lxml_html.HTMLParser(encoding="utf-8")
+                tree = lxml_html.fromstring(html, parser=parser)
+                title_nodes = tree.xpath('//div[@class="workshopItemTitle"]/text()')
+                if title_nodes:
+                    title = title_nodes[0]
+                hrefs = tree.xpath(
+                    '//div[contains(concat(" ", normalize-space(@class), " "),'
+                    ' " collectionItem ")]//a/@href'
+                )
+            except (ValueError, lxml_html.etree.ParserError):
+                hrefs = []
+        
+        if title is None:
+            title_match = _COLLECTION_TITLE_RE.search(html)
+            if title_match:
+                title = title_match.group(1).decode("utf-8", errors="replace")
+        
+        # Ссылки из элементов коллекции; если ID в них не нашлось (ссылок нет
+        # или их формат изменился) - все вхождения на странице
+        matches = (_MOD_ID_RE.search(href) for href in hrefs)
+        mod_ids = SteamHandler._unique_mod_ids(
+            (match.group(1) for match in matches if match is not None),
+            collection_id
+        )
+        if not mod_ids:
+            # ID из цифр декодируются как ASCII
+            mod_ids = SteamHandler._unique_mod_ids(
+                (
+                    match.group(1).decode("ascii")
+                    for match in _MOD_ID_RE_BYTES.finditer(html)
+                ),
+                collection_id
+            )
+        
+        return title, mod_ids
+    
+    @staticmethod
+    def _unique_mod_ids(candidates: Iterable[str], collection_id: str) -> List[str]:
+        """
+        Отбросить повторы и ID самой коллекции, сохранив порядок.
+        
+        Args:
+            candidates: ID модов в порядке страницы.
+            collection_id: ID коллекции (исключается из результата).
+            
+        Returns:
+            Список уникальных ID модов.
+        """
+        # Один проход: проверка по множеству вместо поиска в списке
+        seen = {collection_id}
+        mod_ids = []
+        for mod_id in candidates:
+            if mod_id not in seen:
+                seen.add(mod_id)
+                mod_ids.append(mod_id)
+        return mod_ids
     
     def ensure_download_dir_exists(self) -> bool:
         """
@@ -248,10 +522,13 @@ class SteamHandler:
         self._stop_flag = stop_flag
     
     def stop(self) -> None:
-        """Остановить текущий процесс загрузки."""
-        if self._current_process:
+        """Остановить все текущие процессы загрузки."""
+        with self._processes_lock:
+            processes = list(self._processes)
+        
+        for process in processes:
             try:
-                self._current_process.terminate()
+                process.terminate()
                 self._log("Процесс steamcmd остановлен", "INFO")
             except Exception as e:
                 self._log(f"Ошибка остановки процесса: {str(e)}", "WARNING")
@@ -278,134 +555,472 @@ class SteamHandler:
             Путь к папке мода.
         """
         # Стандартная структура: download_dir/steamapps/workshop/content/294100/{id}
-        return os.path.join(
-            self.download_dir, "steamapps", "workshop", "content", 
-            RIMWORLD_APP_ID, workshop_id
+        return os.path.join(self._mod_content_dir, workshop_id)
+    
+    def get_staging_dir(self, workshop_id: str) -> str:
+        """
+        Получить отдельную директорию установки для параллельной загрузки.
+        
+        Каждый процесс steamcmd получает собственный force_install_dir,
+        чтобы параллельные загрузки не конкурировали за блокировки
+        общей папки steamapps. Директория находится внутри download_dir,
+        поэтому перенос мода на место - это переименование, а не копирование.
+        
+        Args:
+            workshop_id: ID мода в Steam Workshop.
+            
+        Returns:
+            Путь к директории установки.
+        """
+        return os.path.join(self.download_dir, "_staging", workshop_id)
+    
+    def _move_from_staging(self, found_path: str, workshop_id: str, install_dir: str) -> str:
+        """
+        Перенести загруженный мод из директории установки в стандартную папку.
+        
+        Args:
+            found_path: Путь к загруженному моду внутри install_dir.
+            workshop_id: ID мода в Steam Workshop.
+            install_dir: Директория установки, удаляемая после переноса.
+            
+        Returns:
+            Итоговый путь к папке мода.
+        """
+        mod_path = self._move_to_mod_path(found_path, workshop_id)
+        self.cleanup_temp_dir(install_dir)
+        return mod_path
+    
+    def _move_to_mod_path(self, found_path: str, workshop_id: str) -> str:
+        """
+        Перенести папку загруженного мода в стандартное расположение.
+        
+        Args:
+            found_path: Путь к загруженному моду.
+            workshop_id: ID мода в Steam Workshop.
+            
+        Returns:
+            Итоговый путь к папке мода.
+        """
+        mod_path = self.get_mod_path(workshop_id)
+        os.makedirs(os.path.dirname(mod_path), exist_ok=True)
+        if os.path.exists(mod_path):
+            shutil.rmtree(mod_path)
+        
+        shutil.move(found_path, mod_path)
+        return mod_path
+    
+    def _run_steamcmd(
+        self,
+        cmd: List[str],
+        timeout: Optional[float] = None
+    ) -> Optional[Tuple[int, str, str]]:
+        """
+        Запустить steamcmd и дождаться его завершения.
+        
+        Процесс регистрируется в _processes, чтобы stop() мог его прервать.
+        
+        Args:
+            cmd: Командная строка steamcmd.
+            timeout: Максимальное время работы в секундах (None - без ограничения).
+            
+        Returns:
+            Кортеж (код возврата, stdout, stderr) или None, если загрузка
+            остановлена.
+            
+        Raises:
+            subprocess.TimeoutExpired: steamcmd не завершился за timeout секунд.
+        """
+        # Вывод steamcmd нужен только для отладочного лога: без обработчика
+        # логов он не буферизуется в каналах
+        output_pipe = subprocess.PIPE if self.log_callback else subprocess.DEVNULL
+        process = subprocess.Popen(
+            cmd,
+            stdout=output_pipe,
+            stderr=output_pipe,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            universal_newlines=True,
+            startupinfo=_STARTUPINFO,
+            creationflags=_CREATIONFLAGS
         )
+        with self._processes_lock:
+            self._processes.add(process)
+        
+        # Ожидание завершения с проверкой остановки
+        try:
+            output = self._wait_process(process, timeout)
+        finally:
+            with self._processes_lock:
+                self._processes.discard(process)
+        
+        if output is None:
+            return None
+        
+        stdout = output[0] or ""
+        stderr = output[1] or ""
+        
+        # Логируем вывод для отладки
+        if stdout:
+            self._log(f"steamcmd stdout: {stdout[:500]}", "DEBUG")
+        if stderr:
+            self._log(f"steamcmd stderr: {stderr[:500]}", "DEBUG")
+        
+        return process.returncode, stdout, stderr
+    
+    def _wait_process(
+        self,
+        process: subprocess.Popen,
+        timeout: Optional[float] = None
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Дождаться завершения процесса с периодической проверкой остановки.
+        
+        communicate() с таймаутом вычитывает вывод steamcmd по мере
+        поступления и может вызываться повторно без потери данных.
+        
+        Args:
+            process: Запущенный процесс steamcmd.
+            timeout: Максимальное время ожидания в секундах (None - без ограничения).
+            
+        Returns:
+            Кортеж (stdout, stderr) или None, если загрузка остановлена.
+            
+        Raises:
+            subprocess.TimeoutExpired: Процесс не завершился за timeout
+                секунд и был принудительно остановлен.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stopped = self._stop_flag and self._stop_flag()
+            timed_out = deadline is not None and time.monotonic() >= deadline
+            if stopped or timed_out:
+                process.terminate()
+                try:
+                    process.wait(timeout=3)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                if stopped:
+                    return None
+                raise subprocess.TimeoutExpired(process.args, timeout)
+            
+            try:
+                return process.communicate(timeout=PROCESS_POLL_INTERVAL)
+            except subprocess.TimeoutExpired:
+                continue
+    
+    @staticmethod
+    def _has_about_xml(mod_path: str) -> bool:
+        """
+        Проверить наличие непустого About.xml в папке мода.
+        
+        Args:
+            mod_path: Путь к папке мода.
+            
+        Returns:
+            True если About.xml найден и не пуст.
+        """
+        for relative_path in ABOUT_XML_CANDIDATES:
+            try:
+                if os.stat(os.path.join(mod_path, relative_path)).st_size > 0:
+                    return True
+            except OSError:
+                continue
+        return False
     
-    def download_mod(self, workshop_id: str) -> DownloadResult:
+    def download_mod(self, workshop_id: str, install_dir: Optional[str] = None) -> DownloadResult:
         """
         Загрузить мод через steamcmd.
         
+        Потокобезопасен: несколько загрузок могут выполняться одновременно,
+        если каждой передан собственный install_dir (см. get_staging_dir).
+        Неудачная загрузка повторяется до DOWNLOAD_ATTEMPTS раз.
+        
         Args:
             workshop_id: ID мода в Steam Workshop.
+            install_dir: Директория установки steamcmd. По умолчанию
+                download_dir; иначе мод после загрузки переносится в get_mod_path.
             
         Returns:
             DownloadResult с результатом загрузки.
         """
-        if self._stop_flag and self._stop_flag():
-            return DownloadResult(
-                workshop_id=workshop_id,
-                status=DownloadStatus.SKIPPED,
-                error_message="Загрузка остановлена пользователем"
+        skipped = DownloadResult(
+            workshop_id=workshop_id,
+            status=DownloadStatus.SKIPPED,
+            error_message="Загрузка остановлена пользователем"
+        )
+        
+        for attempt in range(DOWNLOAD_ATTEMPTS):
+            if self._stop_flag and self._stop_flag():
+                return skipped
+            
+            result = self._download_once(workshop_id, install_dir)
+            if result.status != DownloadStatus.FAILED or attempt == DOWNLOAD_ATTEMPTS - 1:
+                return result
+            
+            # Экспоненциальная пауза с проверкой флага остановки
+            delay = DOWNLOAD_RETRY_DELAY * (2 ** attempt)
+            self._log(
+                f"Повтор загрузки мода {workshop_id} через {delay:.0f} сек "
+                f"(попытка {attempt + 2}/{DOWNLOAD_ATTEMPTS})",
+                "WARNING"
             )
+            deadline = time.monotonic() + delay
+            while time.monotonic() < deadline:
+                if self._stop_flag and self._stop_flag():
+                    return skipped
+                time.sleep(min(PROCESS_POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
         
-        mod_path = self.get_mod_path(workshop_id)
+        return result
+    
+    def _download_once(self, workshop_id: str, install_dir: Optional[str]) -> DownloadResult:
+        """
+        Одна попытка загрузки мода через steamcmd.
+        
+        Args:
+            workshop_id: ID мода в Steam Workshop.
+            install_dir: Директория установки steamcmd (None - download_dir).
+            
+        Returns:
+            DownloadResult с результатом попытки.
+        """
+        staged = install_dir is not None and install_dir != self.download_dir
+        if install_dir is None:
+            install_dir = self.download_dir
+        
+        mod_path = os.path.join(
+            install_dir, "steamapps", "workshop", "content",
+            RIMWORLD_APP_ID, workshop_id
+        )
         
         cmd = [
             self.steamcmd_path,
-            '+force_install_dir', self.download_dir,
+            '+force_install_dir', install_dir,
             '+login', 'anonymous',
             '+workshop_download_item', RIMWORLD_APP_ID, workshop_id,
             '+quit'
         ]
         
-        # Windows: скрыть консольное окно
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags = subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = 0
-        else:
-            startupinfo = None
-        
         try:
             self._log(f"Загрузка мода {workshop_id}...", "INFO")
             
-            self._current_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.DEVNULL,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
+            output = self._run_steamcmd(cmd, self.download_timeout)
+            if output is None:
+                self._log(f"Загрузка остановлена для мода {workshop_id}", "WARNING")
+                if staged:
+                    self.cleanup_temp_dir(install_dir)
+                return DownloadResult(
+                    workshop_id=workshop_id,
+                    status=DownloadStatus.SKIPPED,
+                    error_message="Загрузка остановлена"
+                )
             
-            # Ожидание завершения с проверкой остановки
-            while True:
-                if self._stop_flag and self._stop_flag():
-                    self._current_process.terminate()
-                    try:
-                        self._current_process.wait(timeout=3)
-                    except subprocess.TimeoutExpired:
-                        self._current_process.kill()
-                    self._log(f"Загрузка остановлена для мода {workshop_id}", "WARNING")
+            retcode = output[0]
+            if retcode != 0:
+                self._log(f"Ошибка загрузки (код {retcode}): {workshop_id}", "ERROR")
+                if staged:
+                    self.cleanup_temp_dir(install_dir)
+                return DownloadResult(
+                    workshop_id=workshop_id,
+                    status=DownloadStatus.FAILED,
+                    error_message=f"steamcmd завершился с кодом {retcode}"
+                )
+            
+            # Проверяем что мод загружен
+            if self._is_nonempty_dir(mod_path):
+                found_path = mod_path
+            else:
+                # Пробуем найти в альтернативных директориях
+                alt_paths = self._find_mod_in_alternate_locations(workshop_id, install_dir)
+                if not alt_paths:
+                    self._log(f"Папка мода не найдена: {mod_path}", "WARNING")
+                    self._log(f"Проверено: {mod_path}, альтернативы: {alt_paths}", "DEBUG")
+                    if staged:
+                        self.cleanup_temp_dir(install_dir)
                     return DownloadResult(
                         workshop_id=workshop_id,
-                        status=DownloadStatus.SKIPPED,
-                        error_message="Загрузка остановлена"
+                        status=DownloadStatus.FAILED,
+                        error_message=f"Папка мода не создана: {mod_path}"
                     )
                 
-                retcode = self._current_process.poll()
-                if retcode is not None:
-                    stdout, stderr = self._current_process.communicate()
-                    self._current_process = None
-                    
-                    # Логируем вывод для отладки
-                    if stdout:
-                        self._log(f"steamcmd stdout: {stdout[:500]}", "DEBUG")
-                    if stderr:
-                        self._log(f"steamcmd stderr: {stderr[:500]}", "DEBUG")
-                    
-                    if retcode == 0:
-                        # Проверяем что мод загружен
-                        if os.path.exists(mod_path) and os.listdir(mod_path):
-                            self._log(f"Мод {workshop_id} загружен: {mod_path}", "SUCCESS")
-                            return DownloadResult(
-                                workshop_id=workshop_id,
-                                status=DownloadStatus.SUCCESS,
-                                mod_path=mod_path
-                            )
-                        
-                        # Пробуем найти в альтернативных директориях
-                        alt_paths = self._find_mod_in_alternate_locations(workshop_id)
-                        if alt_paths:
-                            found_path = alt_paths[0]
-                            self._log(f"Мод найден в альтернативном месте: {found_path}", "INFO")
-                            return DownloadResult(
-                                workshop_id=workshop_id,
-                                status=DownloadStatus.SUCCESS,
-                                mod_path=found_path
-                            )
-                        
-                        self._log(f"Папка мода не найдена: {mod_path}", "WARNING")
-                        self._log(f"Проверено: {mod_path}, альтернативы: {alt_paths}", "DEBUG")
-                        return DownloadResult(
-                            workshop_id=workshop_id,
-                            status=DownloadStatus.FAILED,
-                            error_message=f"Папка мода не создана: {mod_path}"
-                        )
-                    else:
-                        self._log(f"Ошибка загрузки (код {retcode}): {workshop_id}", "ERROR")
-                        return DownloadResult(
-                            workshop_id=workshop_id,
-                            status=DownloadStatus.FAILED,
-                            error_message=f"steamcmd завершился с кодом {retcode}"
-                        )
-                
-                time.sleep(0.1)
-                
+                found_path = alt_paths[0]
+                self._log(f"Мод найден в альтернативном месте: {found_path}", "INFO")
+            
+            # Код 0 от steamcmd не гарантирует загрузку - проверяется About.xml
+            if not self._has_about_xml(found_path):
+                self._log(f"About.xml отсутствует после загрузки: {found_path}", "WARNING")
+                if staged:
+                    self.cleanup_temp_dir(install_dir)
+                return DownloadResult(
+                    workshop_id=workshop_id,
+                    status=DownloadStatus.FAILED,
+                    error_message="Загрузка не завершена: About.xml отсутствует"
+                )
+            
+            if staged:
+                found_path = self._move_from_staging(found_path, workshop_id, install_dir)
+            
+            self._log(f"Мод {workshop_id} загружен: {found_path}", "SUCCESS")
+            return DownloadResult(
+                workshop_id=workshop_id,
+                status=DownloadStatus.SUCCESS,
+                mod_path=found_path
+            )
+            
+        except subprocess.TimeoutExpired:
+            self._log(
+                f"Загрузка мода {workshop_id} прервана: steamcmd не завершился "
+                f"за {self.download_timeout} сек",
+                "ERROR"
+            )
+            if staged:
+                self.cleanup_temp_dir(install_dir)
+            return DownloadResult(
+                workshop_id=workshop_id,
+                status=DownloadStatus.TIMEOUT,
+                error_message=f"Превышено время загрузки ({self.download_timeout} сек)"
+            )
         except Exception as e:
-            self._current_process = None
             self._log(f"Ошибка загрузки {workshop_id}: {str(e)}", "ERROR")
+            if staged:
+                self.cleanup_temp_dir(install_dir)
             return DownloadResult(
                 workshop_id=workshop_id,
                 status=DownloadStatus.FAILED,
                 error_message=str(e)
             )
     
+    def download_mods_batch(
+        self,
+        workshop_ids: List[str],
+        install_dir: Optional[str] = None
+    ) -> List[DownloadResult]:
+        """
+        Загрузить несколько модов одним запуском steamcmd.
+        
+        steamcmd принимает несколько команд +workshop_download_item за один
+        запуск, поэтому запуск процесса и вход в Steam выполняются один раз
+        на пачку. Итог по каждому моду определяется по наличию About.xml
+        после завершения процесса; не загруженные моды повторяются по одному
+        через download_mod.
+        
+        Args:
+            workshop_ids: ID модов в Steam Workshop (не более DOWNLOAD_BATCH_SIZE).
+            install_dir: Директория установки steamcmd. По умолчанию
+                собственная директория пачки в _staging.
+            
+        Returns:
+            Список DownloadResult в порядке workshop_ids.
+        """
+        if len(workshop_ids) == 1:
+            workshop_id = workshop_ids[0]
+            return [self.download_mod(workshop_id, install_dir or self.get_staging_dir(workshop_id))]
+        
+        if self._stop_flag and self._stop_flag():
+            return [
+                DownloadResult(
+                    workshop_id=workshop_id,
+                    status=DownloadStatus.SKIPPED,
+                    error_message="Загрузка остановлена пользователем"
+                )
+                for workshop_id in workshop_ids
+            ]
+        
+        if install_dir is None:
+            install_dir = self.get_staging_dir(f"batch_{workshop_ids[0]}")
+        
+        cmd = [
+            self.steamcmd_path,
+            '+force_install_dir', install_dir,
+            '+login', 'anonymous'
+        ]
+        for workshop_id in workshop_ids:
+            cmd += ['+workshop_download_item', RIMWORLD_APP_ID, workshop_id]
+        cmd.append('+quit')
+        
+        self._log(
+            f"Загрузка {len(workshop_ids)} модов одним запуском steamcmd: "
+            f"{', '.join(workshop_ids)}",
+            "INFO"
+        )
+        
+        # Ограничение времени масштабируется по числу модов в пачке
+        batch_timeout = self.download_timeout * len(workshop_ids)
+        try:
+            output = self._run_steamcmd(cmd, batch_timeout)
+        except subprocess.TimeoutExpired:
+            # Уже загруженные моды пачки забираются как обычно,
+            # остальные повторяются по одному со своим ограничением
+            self._log(
+                f"steamcmd не завершил загрузку пачки за {batch_timeout} сек, "
+                "процесс остановлен",
+                "WARNING"
+            )
+            output = (None, "", "")
+        except Exception as e:
+            self._log(f"Ошибка запуска steamcmd: {str(e)}", "ERROR")
+            self.cleanup_temp_dir(install_dir)
+            return [
+                DownloadResult(
+                    workshop_id=workshop_id,
+                    status=DownloadStatus.FAILED,
+                    error_message=str(e)
+                )
+                for workshop_id in workshop_ids
+            ]
+        
+        if output is None:
+            self._log("Загрузка пачки модов остановлена", "WARNING")
+            self.cleanup_temp_dir(install_dir)
+            return [
+                DownloadResult(
+                    workshop_id=workshop_id,
+                    status=DownloadStatus.SKIPPED,
+                    error_message="Загрузка остановлена"
+                )
+                for workshop_id in workshop_ids
+            ]
+        
+        # Код возврата относится ко всей пачке, поэтому не проверяется:
+        # часть модов могла загрузиться и при ошибке других
+        results = {}
+        retry_ids = []
+        for workshop_id in workshop_ids:
+            found_path = next(
+                (
+                    path for path in self._find_mod_in_alternate_locations(workshop_id, install_dir)
+                    if self._has_about_xml(path)
+                ),
+                None
+            )
+            if found_path is None:
+                retry_ids.append(workshop_id)
+                continue
+            
+            try:
+                mod_path = self._move_to_mod_path(found_path, workshop_id)
+            except OSError as e:
+                self._log(f"Ошибка переноса мода {workshop_id}: {str(e)}", "ERROR")
+                retry_ids.append(workshop_id)
+                continue
+            
+            self._log(f"Мод {workshop_id} загружен: {mod_path}", "SUCCESS")
+            results[workshop_id] = DownloadResult(
+                workshop_id=workshop_id,
+                status=DownloadStatus.SUCCESS,
+                mod_path=mod_path
+            )
+        
+        self.cleanup_temp_dir(install_dir)
+        
+        for workshop_id in retry_ids:
+            self._log(f"Мод {workshop_id} не загружен в пачке, повтор отдельно", "WARNING")
+            results[workshop_id] = self.download_mod(
+                workshop_id, self.get_staging_dir(workshop_id)
+            )
+        
+        return [results[workshop_id] for workshop_id in workshop_ids]
+    
     def download_mod_with_steamcmd(
         self,
         mod_id: str,
@@ -429,108 +1044,121 @@ class SteamHandler:
             '+quit'
         ]
         
-        # Windows: скрыть консольное окно
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags = subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = 0
-        else:
-            startupinfo = None
-        
         try:
             self._log(f"Загрузка мода {mod_id}...", "INFO")
             
+            # Вывод steamcmd здесь не используется: без каналов PIPE процесс
+            # не может зависнуть на переполненном буфере
             process = subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 stdin=subprocess.DEVNULL,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+                startupinfo=_STARTUPINFO,
+                creationflags=_CREATIONFLAGS
             )
+            with self._processes_lock:
+                self._processes.add(process)
             
-            while True:
-                if self._stop_flag and self._stop_flag():
-                    process.terminate()
+            # Блокирующее ожидание: поток просыпается при завершении процесса
+            # или раз в PROCESS_POLL_INTERVAL для проверки флага остановки
+            # и таймаута загрузки
+            deadline = time.monotonic() + self.download_timeout
+            try:
+                while True:
                     try:
-                        process.wait(timeout=3)
+                        retcode = process.wait(timeout=PROCESS_POLL_INTERVAL)
+                        break
                     except subprocess.TimeoutExpired:
-                        process.kill()
-                    self._log(f"Загрузка остановлена для мода {mod_id}", "WARNING")
-                    return False
-                
-                retcode = process.poll()
-                if retcode is not None:
-                    if retcode == 0:
-                        self._log(f"Загрузка успешна: {mod_id}", "SUCCESS")
-                        return True
-                    else:
-                        self._log(f"Загрузка неудачна (код {retcode}): {mod_id}", "ERROR")
-                        return False
-                
-                time.sleep(0.1)
+                        stopped = self._stop_flag and self._stop_flag()
+                        if stopped or time.monotonic() >= deadline:
+                            process.terminate()
+                            try:
+                                process.wait(timeout=3)
+                            except subprocess.TimeoutExpired:
+                                process.kill()
+                            if stopped:
+                                self._log(f"Загрузка остановлена для мода {mod_id}", "WARNING")
+                            else:
+                                self._log(
+                                    f"Загрузка мода {mod_id} прервана: steamcmd не "
+                                    f"завершился за {self.download_timeout} сек",
+                                    "ERROR"
+                                )
+                            return False
+            finally:
+                with self._processes_lock:
+                    self._processes.discard(process)
+            
+            mod_path = os.path.join(
+                str(workshop_dir), "steamapps", "workshop", "content",
+                RIMWORLD_APP_ID, mod_id
+            )
+            if retcode == 0 and self._has_about_xml(mod_path):
+                self._log(f"Загрузка успешна: {mod_id}", "SUCCESS")
+                return True
+            
+            if retcode == 0:
+                self._log(f"Загрузка не завершена, About.xml отсутствует: {mod_id}", "ERROR")
+                return False
+            
+            self._log(f"Загрузка неудачна (код {retcode}): {mod_id}", "ERROR")
+            return False
                 
         except Exception as e:
             self._log(f"Ошибка загрузки {mod_id}: {str(e)}", "ERROR")
             return False
     
-    def _find_mod_in_alternate_locations(self, workshop_id: str) -> List[str]:
+    def _find_mod_in_alternate_locations(
+        self,
+        workshop_id: str,
+        base_dir: Optional[str] = None
+    ) -> List[str]:
         """
         Поиск мода в альтернативных директориях.
         Steamcmd может создавать разные структуры папок.
         
         Args:
             workshop_id: ID мода в Steam Workshop.
+            base_dir: Директория установки steamcmd (по умолчанию download_dir).
             
         Returns:
             Список найденных путей к моду.
         """
-        found_paths = []
-        
-        # Стандартная структура
-        standard_path = os.path.join(
-            self.download_dir, "steamapps", "workshop", "content", 
-            RIMWORLD_APP_ID, workshop_id
-        )
-        if os.path.exists(standard_path) and os.listdir(standard_path):
-            found_paths.append(standard_path)
+        if base_dir is None:
+            base_dir = self.download_dir
         
-        # downloads структура (где steamcmd реально создаёт файлы)
-        downloads_path = os.path.join(
-            self.download_dir, "steamapps", "workshop", "downloads",
-            RIMWORLD_APP_ID, workshop_id
-        )
-        if os.path.exists(downloads_path) and os.listdir(downloads_path):
-            found_paths.append(downloads_path)
-        
-        # Временная структура без steamapps
-        temp_path1 = os.path.join(
-            self.download_dir, "workshop", "content", 
-            RIMWORLD_APP_ID, workshop_id
-        )
-        if os.path.exists(temp_path1) and os.listdir(temp_path1) and temp_path1 not in found_paths:
-            found_paths.append(temp_path1)
-        
-        temp_path2 = os.path.join(
-            self.download_dir, "workshop", "downloads",
-            RIMWORLD_APP_ID, workshop_id
-        )
-        if os.path.exists(temp_path2) and os.listdir(temp_path2) and temp_path2 not in found_paths:
-            found_paths.append(temp_path2)
-        
-        # Просто папка с ID в download_dir
-        simple_path = os.path.join(self.download_dir, workshop_id)
-        if os.path.exists(simple_path) and os.listdir(simple_path) and simple_path not in found_paths:
-            found_paths.append(simple_path)
+        found_paths = []
+        for location in _MOD_LOCATIONS:
+            path = os.path.join(base_dir, location, workshop_id)
+            if self._is_nonempty_dir(path):
+                found_paths.append(path)
         
         if found_paths:
             self._log(f"Мод {workshop_id} найден в: {found_paths}", "DEBUG")
         
         return found_paths
     
+    @staticmethod
+    def _is_nonempty_dir(path: str) -> bool:
+        """
+        Проверить, что путь - непустая директория.
+        
+        Читается только первая запись каталога, без построения списка
+        всех файлов, как при os.listdir.
+        
+        Args:
+            path: Проверяемый путь.
+            
+        Returns:
+            True если директория существует и содержит хотя бы одну запись.
+        """
+        try:
+            with os.scandir(path) as it:
+                return next(it, None) is not None
+        except OSError:
+            return False
+    
     def is_mod_downloaded(self, workshop_id: str) -> bool:
         """
         Проверить, загружен ли мод.
@@ -542,14 +1170,41 @@ class SteamHandler:
             True если папка мода существует и не пуста.
         """
         mod_path = self.get_mod_path(workshop_id)
-        return os.path.exists(mod_path) and os.listdir(mod_path)
+        return self._is_nonempty_dir(mod_path)
     
-    def delete_mod(self, workshop_id: str) -> bool:
+    def scan_downloaded_mods(self) -> Dict[str, str]:
+        """
+        Получить все загруженные моды одним чтением каталога.
+        
+        Заменяет проверку is_mod_downloaded для каждого мода коллекции
+        (несколько системных вызовов на мод) одним os.scandir. Пустые
+        папки не отсеиваются: для них не найдётся About.xml.
+        
+        Returns:
+            Словарь {workshop_id: путь к папке мода}.
+        """
+        try:
+            with os.scandir(self._mod_content_dir) as it:
+                return {
+                    entry.name: entry.path
+                    for entry in it
+                    if entry.is_dir()
+                }
+        except OSError:
+            return {}
+    
+    def _trash_dir(self) -> str:
+        """Директория для модов, ожидающих фонового удаления."""
+        return os.path.join(self.download_dir, "_trash")
+    
+    def delete_mod(self, workshop_id: str, background: bool = False) -> bool:
         """
         Удалить загруженный мод.
         
         Args:
             workshop_id: ID мода в Steam Workshop.
+            background: Не удалять файлы сразу, а атомарно перенести папку
+                мода в корзину; сами файлы удаляет purge_trash в фоне.
             
         Returns:
             True если удаление успешно.
@@ -561,13 +1216,86 @@ class SteamHandler:
             return True  # Считаем успехом если папки нет
         
         try:
-            shutil.rmtree(mod_path)
+            if background:
+                trash_dir = self._trash_dir()
+                os.makedirs(trash_dir, exist_ok=True)
+                # Уникальная папка в корзине: повторное удаление того же мода
+                # не конфликтует с ещё не удалённой копией
+                slot = tempfile.mkdtemp(prefix=f"{workshop_id}_", dir=trash_dir)
+                os.replace(mod_path, os.path.join(slot, workshop_id))
+            else:
+                shutil.rmtree(mod_path)
             self._log(f"Мод {workshop_id} удалён", "DEBUG")
             return True
         except Exception as e:
             self._log(f"Ошибка удаления мода {workshop_id}: {str(e)}", "ERROR")
             return False
     
+    def purge_trash(self) -> Optional[threading.Thread]:
+        """
+        Удалить содержимое корзины в фоновом потоке.
+        
+        Удаление тысяч мелких файлов может занимать десятки секунд, поэтому
+        оно не задерживает завершение обработки. Папки модов в корзине
+        независимы и удаляются параллельно (см. _purge_dir). Остатки,
+        не удалённые до выхода из программы, будут удалены при следующем вызове.
+        
+        Returns:
+            Запущенный поток или None, если корзина пуста.
+        """
+        trash_dir = self._trash_dir()
+        if not os.path.isdir(trash_dir):
+            return None
+        
+        thread = threading.Thread(
+            target=self._purge_dir,
+            args=(trash_dir,),
+            name="mod-trash-purge",
+            daemon=True
+        )
+        thread.start()
+        return thread
+    
+    @staticmethod
+    def _purge_dir(path: str) -> None:
+        """
+        Удалить директорию, обрабатывая её подпапки параллельно.
+        
+        Удаление файлов ограничено вводом-выводом, поэтому несколько
+        потоков ускоряют его на SSD почти пропорционально их числу.
+        Потоки - демоны, как и вызывающий поток: ThreadPoolExecutor здесь
+        не подходит, так как его потоки ожидаются при выходе из программы.
+        
+        Args:
+            path: Путь к удаляемой директории.
+        """
+        try:
+            with os.scandir(path) as it:
+                entries = [entry.path for entry in it]
+        except OSError:
+            return
+        
+        def remove_all(paths: List[str]) -> None:
+            for entry_path in paths:
+                shutil.rmtree(entry_path, ignore_errors=True)
+        
+        workers = min(MAX_PARALLEL_DOWNLOADS, len(entries))
+        threads = [
+            threading.Thread(
+                target=remove_all,
+                args=(entries[k::workers],),
+                name="mod-trash-purge",
+                daemon=True
+            )
+            for k in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        shutil.rmtree(path, ignore_errors=True)
+    
     def extract_package_id(self, mod_path: str, workshop_id: str) -> Optional[str]:
         """
         Извлечь packageId из About.xml файла мода.
@@ -583,68 +1311,29 @@ class SteamHandler:
         self._log(f"extract_package_id: mod_path={mod_path}", "DEBUG")
         self._log(f"Поиск About.xml в: {mod_path}", "DEBUG")
         
-        if os.path.exists(mod_path):
-            contents = os.listdir(mod_path)
-            self._log(f"Содержимое папки мода: {contents}", "DEBUG")
-        else:
+        try:
+            with os.scandir(mod_path) as it:
+                entries = list(it)
+        except OSError:
             self._log(f"ПАПКА МОДА НЕ СУЩЕСТВУЕТ: {mod_path}", "DEBUG")
             return None
+        if self.log_callback:
+            self._log(f"Содержимое папки мода: {[entry.name for entry in entries]}", "DEBUG")
         
-        # Возможные пути к About.xml (стандартные)
-        about_paths = [
-            os.path.join(mod_path, "About", "About.xml"),
-            os.path.join(mod_path, "about", "About.xml"),
-            os.path.join(mod_path, "About", "about.xml"),
-            os.path.join(mod_path, "about", "about.xml"),
-            os.path.join(mod_path, "About.xml"),
-            os.path.join(mod_path, "about.xml"),
-        ]
-        
-        about_xml = None
-        for path in about_paths:
-            if os.path.exists(path):
-                about_xml = path
-                self._log(f"About.xml найден по стандартному пути: {about_xml}", "DEBUG")
-                break
-        
-        # Если не найден по стандартным путям - рекурсивный поиск по всей папке
-        if not about_xml:
-            self._log(f"About.xml не найден по стандартным путям, выполняем рекурсивный поиск...", "DEBUG")
-            
-            found_count = 0
-            for root, dirs, files in os.walk(mod_path):
-                for file in files:
-                    if file.lower() == "about.xml":
-                        found_count += 1
-                        about_xml = os.path.join(root, file)
-                        self._log(f"About.xml #{found_count} найден: {about_xml}", "DEBUG")
-                        
-                        # Проверяем что это правильный About.xml (в папке About/)
-                        rel_path = os.path.relpath(about_xml, mod_path)
-                        rel_path_lower = rel_path.lower()
-                        
-                        # About.xml должен быть в папке About/ или в корне
-                        if rel_path_lower.startswith("about") or "\\" not in rel_path and "/" not in rel_path:
-                            self._log(f"Используем About.xml: {about_xml}", "DEBUG")
-                            break
-                if about_xml:
-                    break
+        about_xml = self._find_about_xml(entries)
+        if about_xml:
+            self._log(f"About.xml найден: {about_xml}", "DEBUG")
         
         if not about_xml:
             self._log(f"About.xml не найден для {workshop_id}", "WARNING")
             return None
         
         try:
-            import xml.etree.ElementTree as ET
-            tree = ET.parse(about_xml)
-            root = tree.getroot()
-            
-            # Поиск тега packageId (без учёта регистра)
-            for elem in root:
-                if elem.tag.lower() == 'packageid' and elem.text:
-                    package_id = elem.text.strip().lower()
-                    self._log(f"packageId найден: {package_id}", "DEBUG")
-                    return package_id
+            package_id = self._read_package_id(about_xml)
+            if package_id:
+                package_id = package_id.strip().lower()
+                self._log(f"packageId найден: {package_id}", "DEBUG")
+                return package_id
             
             self._log(f"Тег packageId не найден в XML для {workshop_id}", "WARNING")
             return None
@@ -653,6 +1342,101 @@ class SteamHandler:
             self._log(f"Ошибка парсинга About.xml: {str(e)}", "ERROR")
             return None
     
+    @staticmethod
+    def _read_package_id(about_xml: str) -> Optional[str]:
+        """
+        Прочитать packageId из About.xml.
+        
+        packageId обычно идёт в начале файла, поэтому сначала первые
+        PACKAGE_ID_SCAN_BYTES байт проверяются регулярным выражением.
+        Совпадение принимается, только если тег - прямой потомок корня,
+        а текст не содержит ссылок на сущности. Иначе (или если тег не
+        найден) файл разбирается потоково: чтение прекращается на первом
+        подходящем теге. Используется lxml (необязательная
+        зависимость) в режиме recover, иначе стандартный парсер.
+        
+        Args:
+            about_xml: Путь к About.xml.
+            
+        Returns:
+            Текст тега packageId (прямой потомок корня, без учёта
+            регистра) или None.
+        """
+        with open(about_xml, "rb") as f:
+            head = f.read(PACKAGE_ID_SCAN_BYTES)
+        
+        match = _PACKAGE_ID_RE.search(head)
+        if (
+            match
+            and b"&" not in match.group(1)
+            and _is_root_child_position(head, match.start())
+        ):
+            return match.group(1).decode("utf-8", errors="replace")
+        
+        try:
+            from lxml import etree
+            
+            def iterparse(source):
+                return etree.iterparse(
+                    source,
+                    events=("start", "end"),
+                    recover=True,
+                    resolve_entities=False
+                )
+        except ImportError:
+            import xml.etree.ElementTree as ET
+            
+            def iterparse(source):
+                return ET.iterparse(source, events=("start", "end"))
+        
+        depth = 0
+        with open(about_xml, "rb") as f:
+            for event, elem in iterparse(f):
+                if event == "start":
+                    depth += 1
+                    continue
+                
+                depth -= 1
+                if depth != 1:
+                    continue
+                
+                # Узлы комментариев и сущностей lxml имеют нестроковый tag
+                if isinstance(elem.tag, str) and elem.tag.lower() == "packageid" and elem.text:
+                    return elem.text
+                elem.clear()
+        
+        return None
+    
+    @staticmethod
+    def _find_about_xml(entries: List[os.DirEntry]) -> Optional[str]:
+        """
+        Найти About.xml среди содержимого папки мода.
+        
+        RimWorld читает About.xml только из папки About в корне мода,
+        поэтому вместо обхода всего дерева (текстуры, сборки, Defs)
+        просматриваются корень и папка About без учёта регистра.
+        
+        Args:
+            entries: Содержимое корня папки мода (os.scandir).
+            
+        Returns:
+            Путь к About.xml или None.
+        """
+        root_file = None
+        for entry in entries:
+            name = entry.name.lower()
+            try:
+                if name == "about" and entry.is_dir():
+                    with os.scandir(entry.path) as it:
+                        for child in it:
+                            if child.name.lower() == "about.xml" and child.is_file():
+                                return child.path
+                elif name == "about.xml" and root_file is None and entry.is_file():
+                    root_file = entry.path
+            except OSError:
+                continue
+        return root_file
+    
     def get_downloaded_mods_list(self, workshop_dir: str) -> List[str]:
         """
         Получить список загруженных модов из директории.
@@ -664,15 +1448,19 @@ class SteamHandler:
             Список ID загруженных модов.
         """
         mods = []
-        content_path = Path(workshop_dir) / "steamapps/workshop/content/294100"
-        
-        if not content_path.exists():
-            return mods
+        content_path = os.path.join(
+            workshop_dir, "steamapps", "workshop", "content", RIMWORLD_APP_ID
+        )
         
-        for mod_id in os.listdir(content_path):
-            mod_path = content_path / mod_id
-            if mod_path.is_dir() and os.listdir(mod_path):
-                mods.append(mod_id)
+        # Отсутствие директории обрабатывается вместе с прочими ошибками
+        # чтения, без отдельного stat через os.path.exists
+        try:
+            with os.scandir(content_path) as it:
+                for entry in it:
+                    if entry.is_dir() and self._is_nonempty_dir(entry.path):
+                        mods.append(entry.name)
+        except OSError:
+            pass
         
         return mods
     
@@ -3,6 +3,8 @@
 Определяет цветовую схему и стили виджетов PyQt6.
 """
 
+from functools import lru_cache
+
 # Цветовая палитра - тёмный неоновый стиль
 COLORS = {
     # Основные цвета фона
@@ -48,10 +50,14 @@ LOG_COLORS = {
 }
 
 
+@lru_cache(maxsize=1)
 def get_main_stylesheet() -> str:
     """
     Получить основную таблицу стилей приложения.
     
+    Палитра COLORS не меняется во время работы, поэтому строка
+    собирается один раз и затем возвращается из кэша.
+    
     Returns:
         CSS-подобная строка стилей для PyQt6.
     """
@@ -80,11 +86,6 @@ def get_main_stylesheet() -> str:
         color: {COLORS["neon_cyan"]};
     }}
     
-    QLabel[class="subtitle"] {{
-        font-size: 12px;
-        color: {COLORS["text_secondary"]};
-    }}
-    
     /* Поля ввода */
     QLineEdit {{
         background-color: {COLORS["bg_input"]};
@@ -99,7 +100,6 @@ def get_main_stylesheet() -> str:
     
     QLineEdit:focus {{
         border-color: {COLORS["neon_cyan"]};
-        box-shadow: 0 0 10px {COLORS["border_glow"]};
     }}
     
     QLineEdit:hover {{
@@ -161,18 +161,8 @@ def get_main_stylesheet() -> str:
         color: {COLORS["text_primary"]};
     }}
     
-    QPushButton[class="success"] {{
-        border-color: {COLORS["neon_green"]};
-        color: {COLORS["neon_green"]};
-    }}
-    
-    QPushButton[class="success"]:hover {{
-        background-color: {COLORS["neon_green"]};
-        color: {COLORS["bg_dark"]};
-    }}
-    
     /* Текстовое поле (логи) */
-    QTextEdit {{
+    QPlainTextEdit {{
         background-color: {COLORS["bg_dark"]};
         border: 2px solid {COLORS["border_dark"]};
         border-radius: 8px;
@@ -181,7 +171,7 @@ def get_main_stylesheet() -> str:
         font-family: 'Consolas', 'Courier New', monospace;
     }}
     
-    QTextEdit:focus {{
+    QPlainTextEdit:focus {{
         border-color: {COLORS["neon_purple"]};
     }}
     
@@ -213,51 +203,35 @@ def get_main_stylesheet() -> str:
         background: none;
     }}
     
-    /* Радиокнопки */
-    QRadioButton {{
+    /* Радиокнопки и чекбоксы: общие правила, различается только
+       скругление индикатора */
+    QRadioButton, QCheckBox {{
         color: {COLORS["text_primary"]};
         spacing: 10px;
         padding: 5px;
     }}
     
-    QRadioButton::indicator {{
+    QRadioButton::indicator, QCheckBox::indicator {{
         width: 20px;
         height: 20px;
-        border-radius: 10px;
         border: 2px solid {COLORS["border_light"]};
         background-color: {COLORS["bg_input"]};
     }}
     
-    QRadioButton::indicator:checked {{
-        background-color: {COLORS["neon_cyan"]};
-        border-color: {COLORS["neon_cyan"]};
-    }}
-    
-    QRadioButton::indicator:hover {{
-        border-color: {COLORS["neon_cyan"]};
-    }}
-    
-    /* Чекбоксы */
-    QCheckBox {{
-        color: {COLORS["text_primary"]};
-        spacing: 10px;
-        padding: 5px;
+    QRadioButton::indicator {{
+        border-radius: 10px;
     }}
     
     QCheckBox::indicator {{
-        width: 20px;
-        height: 20px;
         border-radius: 4px;
-        border: 2px solid {COLORS["border_light"]};
-        background-color: {COLORS["bg_input"]};
     }}
     
-    QCheckBox::indicator:checked {{
+    QRadioButton::indicator:checked, QCheckBox::indicator:checked {{
         background-color: {COLORS["neon_cyan"]};
         border-color: {COLORS["neon_cyan"]};
     }}
     
-    QCheckBox::indicator:hover {{
+    QRadioButton::indicator:hover, QCheckBox::indicator:hover {{
         border-color: {COLORS["neon_cyan"]};
     }}
     
@@ -323,27 +297,6 @@ def get_main_stylesheet() -> str:
         background-color: {COLORS["hover"]};
     }}
     
-    /* Разделитель */
-    QFrame[frameShape="4"] {{
-        background-color: {COLORS["border_dark"]};
-        max-height: 2px;
-    }}
-    
-    QFrame[frameShape="5"] {{
-        background-color: {COLORS["border_dark"]};
-        max-width: 2px;
-    }}
-    
-    /* Всплывающие подсказки */
-    QToolTip {{
-        background-color: {COLORS["bg_tertiary"]};
-        border: 1px solid {COLORS["neon_cyan"]};
-        border-radius: 5px;
-        padding: 8px;
-        color: {COLORS["text_primary"]};
-        font-size: 12px;
-    }}
-    
     /* Меню */
     QMenu {{
         background-color: {COLORS["bg_secondary"]};
@@ -369,28 +322,95 @@ def get_main_stylesheet() -> str:
     """
 
 
-def get_log_html_style(level: str, message: str, timestamp: str = "") -> str:
+# Таблица стилей документа панели логов: цвета задаются классами один раз,
+# а строки лога содержат только ссылки на классы
+LOG_DOCUMENT_STYLESHEET = "".join(
+    [
+        f'.ts {{ color: {COLORS["text_muted"]}; }}',
+        f'.msg {{ color: {COLORS["text_primary"]}; }}',
+        f'.lvl {{ color: {COLORS["text_primary"]}; font-weight: bold; }}',
+    ] + [
+        f'.lvl-{level.lower()} {{ color: {color}; font-weight: bold; }}'
+        for level, color in LOG_COLORS.items()
+    ]
+)
+
+# HTML строки лога: префиксы уровней и обрамление отформатированы заранее,
+# чтобы сборка строки сводилась к конкатенации
+_LOG_TIMESTAMP_PREFIX = '<span class="ts">['
+_LOG_TIMESTAMP_SUFFIX = ']</span> '
+_LOG_MESSAGE_SUFFIX = '</span>'
+
+
+def _log_message_prefix(level: str, css_class: str) -> str:
+    """Префикс строки лога: метка уровня и открывающий тег текста."""
+    return f'<span class="{css_class}">[{level}]</span> <span class="msg">'
+
+
+_LOG_MESSAGE_PREFIX = {
+    level: _log_message_prefix(level, f"lvl-{level.lower()}")
+    for level in LOG_COLORS
+}
+
+
+def get_log_html_style(
+    level: str,
+    message: str,
+    timestamp: str = "",
+    line_break: bool = True
+) -> str:
     """
     Получить HTML-форматированную строку лога.
     
+    Текст сообщения экранируется: вывод steamcmd и пути с символами
+    < > & отображаются как есть, а не разбираются как разметка.
+    
     Args:
         level: Уровень логирования (INFO, SUCCESS, WARNING, ERROR, DEBUG).
         message: Текст сообщения.
         timestamp: Временная метка (опционально).
+        line_break: Завершать строку тегом <br>. Без него фрагмент
+            вставляется отдельным блоком документа.
         
     Returns:
-        HTML-строка с цветным форматированием.
+        HTML-строка с цветным форматированием. Цвета задаются классами,
+        документ должен использовать LOG_DOCUMENT_STYLESHEET.
     """
-    color = LOG_COLORS.get(level, COLORS["text_primary"])
+    prefix = _LOG_MESSAGE_PREFIX.get(level)
+    if prefix is None:
+        prefix = _log_message_prefix(level, "lvl")
     
-    timestamp_html = ""
-    if timestamp:
-        timestamp_html = f'<span style="color: {COLORS["text_muted"]};">[{timestamp}]</span> '
+    if "&" in message or "<" in message or ">" in message:
+        message = message.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
     
-    level_html = f'<span style="color: {color}; font-weight: bold;">[{level}]</span>'
-    message_html = f'<span style="color: {COLORS["text_primary"]};">{message}</span>'
+    html = prefix + message + _LOG_MESSAGE_SUFFIX
+    if timestamp:
+        html = _LOG_TIMESTAMP_PREFIX + timestamp + _LOG_TIMESTAMP_SUFFIX + html
+    return html + "<br>" if line_break else html
+
+
+def get_log_plain_text(level: str, message: str, timestamp: str = "") -> str:
+    """
+    Получить строку лога без разметки (для копирования в буфер обмена).
     
-    return f'{timestamp_html}{level_html} {message_html}<br>'
+    Args:
+        level: Уровень логирования.
+        message: Текст сообщения.
+        timestamp: Временная метка (опционально).
+        
+    Returns:
+        Строка в том же виде, в каком она отображается в панели логов.
+    """
+    if timestamp:
+        return f"[{timestamp}] [{level}] {message}"
+    return f"[{level}] {message}"
+
+
+# Заливка прогресс-бара по диапазонам прогресса (строки готовые, без
+# форматирования на каждое обновление)
+_PROGRESS_BACKGROUND_LOW = f"background: {COLORS['neon_red']};"
+_PROGRESS_BACKGROUND_MID = f"background: {COLORS['neon_yellow']};"
+_PROGRESS_BACKGROUND_HIGH = f"background: {COLORS['neon_green']};"
 
 
 def get_progress_gradient(progress: float) -> str:
@@ -404,11 +424,11 @@ def get_progress_gradient(progress: float) -> str:
         CSS градиент.
     """
     if progress < 0.3:
-        return f"background: {COLORS['neon_red']};"
+        return _PROGRESS_BACKGROUND_LOW
     elif progress < 0.7:
-        return f"background: {COLORS['neon_yellow']};"
+        return _PROGRESS_BACKGROUND_MID
     else:
-        return f"background: {COLORS['neon_green']};"
+        return _PROGRESS_BACKGROUND_HIGH
 
 
 # Дополнительные стили для специфических виджетов
@@ -5,16 +5,173 @@
 
 import os
 import re
+import sys
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
-from typing import Optional, List, Tuple, Callable
+from typing import Optional, List, Tuple, Callable, Iterable, Iterator
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+# lxml (необязательная зависимость) - быстрее стандартного парсера и в режиме
+# recover читает повреждённые About.xml, которые нередко встречаются в модах
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_etree = None
 
-@dataclass
+# Исключения разбора XML для обоих парсеров
+_XML_PARSE_ERRORS = (ET.ParseError,) if _lxml_etree is None else (
+    ET.ParseError, _lxml_etree.XMLSyntaxError
+)
+
+
+def _iterparse_about(source):
+    """
+    Потоковый разбор About.xml (события start/end).
+    
+    Args:
+        source: Файловый объект, открытый в двоичном режиме.
+        
+    Returns:
+        Итератор пар (событие, элемент).
+    """
+    if _lxml_etree is not None:
+        return _lxml_etree.iterparse(
+            source,
+            events=("start", "end"),
+            recover=True,
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False
+        )
+    return ET.iterparse(source, events=("start", "end"))
+
+
+# Индексы извлекаемых полей About.xml по тегу в нижнем регистре; теги в
+# обычном написании (packageId, name, ...) находятся без вызова lower()
+_ABOUT_FIELD_INDEX = {"packageid": 0, "name": 1, "author": 2, "description": 3}
+_ABOUT_FIELD_INDEX["packageId"] = _ABOUT_FIELD_INDEX["packageid"]
+
+
+@lru_cache(maxsize=4096)
+def _read_about_fields(
+    about_xml_path: str,
+    mtime_ns: int,
+    size: int
+) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    """
+    Прочитать packageId, name, author и description из About.xml.
+    
+    Результат кэшируется по пути, времени изменения и размеру файла:
+    повторные запуски обработки не разбирают неизменённые About.xml
+    уже загруженных модов заново. Исключения разбора не кэшируются.
+    
+    Чтение прекращается, когда встречены все четыре разных тега; при
+    повторах тега до этого момента берётся последнее значение.
+    
+    Args:
+        about_xml_path: Путь к About.xml.
+        mtime_ns: Время изменения файла (часть ключа кэша).
+        size: Размер файла (часть ключа кэша).
+        
+    Returns:
+        Кортеж (package_id, name, author, description), отсутствующие
+        теги - None.
+    """
+    # Потоковый разбор XML: дерево целиком не строится, обработанные
+    # элементы очищаются, а чтение файла прекращается, как только
+    # найдены все нужные теги
+    fields = [None, None, None, None]
+    # Битовая маска заполненных полей: повторный тег перезаписывает
+    # значение, но не приближает завершение чтения
+    seen = 0
+    depth = 0
+    
+    with open(about_xml_path, "rb") as f:
+        for event, elem in _iterparse_about(f):
+            if event == "start":
+                depth += 1
+                continue
+            
+            depth -= 1
+            if depth != 1:
+                # Интересуют только прямые потомки корневого элемента
+                continue
+            
+            # Поиск нужных тегов (без учёта регистра); узлы-сущности
+            # lxml имеют нестроковый tag и пропускаются
+            tag = elem.tag
+            if not isinstance(tag, str):
+                continue
+            index = _ABOUT_FIELD_INDEX.get(tag)
+            if index is None:
+                index = _ABOUT_FIELD_INDEX.get(tag.lower())
+            
+            if index is not None:
+                fields[index] = elem.text
+                seen |= 1 << index
+            
+            elem.clear()
+            if seen == 0b1111:
+                break
+    
+    return fields[0], fields[1], fields[2], fields[3]
+
+
+def _escape(text: str) -> str:
+    """
+    Экранировать текст элемента XML (совпадает с выводом minidom).
+    
+    Вместо xml.sax.saxutils.escape: тот модуль при импорте подтягивает
+    urllib.request и ssl, что заметно замедляет запуск.
+    
+    Args:
+        text: Исходный текст.
+        
+    Returns:
+        Экранированный текст.
+    """
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+    )
+
+
+def _xml_element(tag: str, text: Optional[str], indent: str) -> str:
+    """
+    Сформировать строку простого элемента с экранированным текстом.
+    
+    Args:
+        tag: Имя тега.
+        text: Текст элемента (пустой - самозакрывающийся тег).
+        indent: Отступ строки.
+        
+    Returns:
+        Строка XML без перевода строки.
+    """
+    if not text:
+        return f"{indent}<{tag}/>"
+    return f"{indent}<{tag}>{_escape(text)}</{tag}>"
+
+
+# knownExpansions - базовые DLC RimWorld; блок не зависит от списка модов
+# и собирается один раз
+_KNOWN_EXPANSIONS_BLOCK = (
+    '    <knownExpansions>\n'
+    '        <li>ludeon.rimworld</li>\n'
+    '        <li>ludeon.rimworld.royalty</li>\n'
+    '        <li>ludeon.rimworld.ideology</li>\n'
+    '        <li>ludeon.rimworld.biotech</li>\n'
+    '        <li>ludeon.rimworld.anomaly</li>\n'
+    '    </knownExpansions>\n'
+)
+
+
+@dataclass(slots=True, frozen=True)
 class ModInfo:
-    """Информация о моде, извлечённая из About.xml."""
+    """Информация о моде, извлечённая из About.xml (неизменяемая, без __dict__)."""
     workshop_id: str
     package_id: str
     name: Optional[str] = None
@@ -33,15 +190,9 @@ class XmlProcessor:
     Извлекает информацию из About.xml и генерирует XML для RimPy.
     """
     
-    # Возможные пути к файлу About.xml (с учётом регистра)
-    ABOUT_XML_PATHS = [
-        "About/About.xml",
-        "about/About.xml",
-        "About/about.xml",
-        "about/about.xml",
-        "About.xml",
-        "about.xml"
-    ]
+    # Обычное расположение About.xml; другие регистры и About.xml в корне
+    # мода find_about_xml находит просмотром каталогов
+    ABOUT_XML_PATH = os.path.join("About", "About.xml")
     
     def __init__(self, log_callback: Optional[Callable[[str, str], None]] = None):
         """
@@ -67,26 +218,42 @@ class XmlProcessor:
         """
         Найти файл About.xml в папке мода.
         
+        Обычное расположение (About/About.xml) проверяется одним stat.
+        Иначе без учёта регистра просматриваются только корень мода и
+        папка About: RimWorld не ищет About.xml глубже, а обход всего
+        дерева мода (текстуры, сборки, Defs) стоит сотен системных вызовов.
+        
         Args:
             mod_path: Путь к папке мода.
             
         Returns:
             Полный путь к About.xml или None если не найден.
         """
-        for relative_path in self.ABOUT_XML_PATHS:
-            full_path = os.path.join(mod_path, relative_path)
-            if os.path.exists(full_path):
-                return full_path
-        
-        # Поиск без учёта регистра (для Linux/Mac)
-        for root, dirs, files in os.walk(mod_path):
-            for file in files:
-                if file.lower() == "about.xml":
-                    parent_dir = os.path.basename(root).lower()
-                    if parent_dir == "about" or root == mod_path:
-                        return os.path.join(root, file)
-        
-        return None
+        full_path = os.path.join(mod_path, self.ABOUT_XML_PATH)
+        if os.path.isfile(full_path):
+            return full_path
+        
+        root_file = None
+        try:
+            with os.scandir(mod_path) as it:
+                entries = list(it)
+        except OSError:
+            return None
+        
+        for entry in entries:
+            name = entry.name.lower()
+            try:
+                if name == "about" and entry.is_dir():
+                    with os.scandir(entry.path) as it:
+                        for child in it:
+                            if child.name.lower() == "about.xml" and child.is_file():
+                                return child.path
+                elif name == "about.xml" and root_file is None and entry.is_file():
+                    root_file = entry.path
+            except OSError:
+                continue
+        
+        return root_file
     
     def extract_package_id(self, mod_path: str, workshop_id: str) -> Optional[ModInfo]:
         """
@@ -109,27 +276,10 @@ class XmlProcessor:
             return None
         
         try:
-            # Чтение и парсинг XML
-            tree = ET.parse(about_xml_path)
-            root = tree.getroot()
-            
-            # Поиск packageId (без учёта регистра тега)
-            package_id = None
-            name = None
-            author = None
-            description = None
-            
-            for elem in root:
-                tag_lower = elem.tag.lower()
-                
-                if tag_lower == "packageid":
-                    package_id = elem.text
-                elif tag_lower == "name":
-                    name = elem.text
-                elif tag_lower == "author":
-                    author = elem.text
-                elif tag_lower == "description":
-                    description = elem.text
+            st = os.stat(about_xml_path)
+            package_id, name, author, description = _read_about_fields(
+                about_xml_path, st.st_mtime_ns, st.st_size
+            )
             
             if not package_id:
                 self._log(
@@ -138,8 +288,10 @@ class XmlProcessor:
                 )
                 return None
             
-            # Приведение packageId к нижнему регистру
-            package_id_lower = package_id.strip().lower()
+            # Приведение packageId к нижнему регистру; строка интернируется:
+            # один и тот же packageId встречается в ModInfo, кэше БД и
+            # списках модов, а сравнение интернированных строк быстрее
+            package_id_lower = sys.intern(package_id.strip().lower())
             
             self._log(
                 f"Извлечён packageId для мода {workshop_id}: {package_id_lower}", 
@@ -154,7 +306,7 @@ class XmlProcessor:
                 description=description
             )
             
-        except ET.ParseError as e:
+        except _XML_PARSE_ERRORS as e:
             self._log(
                 f"Ошибка парсинга XML для мода {workshop_id}: {str(e)}", 
                 "ERROR"
@@ -182,37 +334,30 @@ class XmlProcessor:
         Returns:
             Строка с XML содержимым.
         """
-        # Создание корневого элемента
-        root = ET.Element("ModList")
+        # Документ фиксированной структуры собирается напрямую строками,
+        # без построения дерева элементов и повторного разбора для отступов
+        parts = [
+            '<?xml version="1.0" ?>',
+            '<ModList>',
+            _xml_element("Name", list_name, "  "),
+            # Версия (для совместимости с RimPy)
+            '  <Version>1.0</Version>'
+        ]
         
-        # Добавление метаданных
-        name_elem = ET.SubElement(root, "Name")
-        name_elem.text = list_name
-        
-        # Добавление версии (для совместимости с RimPy)
-        version_elem = ET.SubElement(root, "Version")
-        version_elem.text = "1.0"
-        
-        # Создание списка модов
-        mods_elem = ET.SubElement(root, "Mods")
-        
-        for mod_info in mod_infos:
-            mod_elem = ET.SubElement(mods_elem, "li")
-            mod_elem.text = mod_info.package_id
-        
-        # Форматирование XML с отступами
-        xml_string = ET.tostring(root, encoding="unicode")
-        
-        # Добавление XML декларации и форматирование
-        dom = minidom.parseString(xml_string)
-        formatted_xml = dom.toprettyxml(indent="  ", encoding=None)
+        if mod_infos:
+            parts.append('  <Mods>')
+            parts.extend(
+                _xml_element("li", mod_info.package_id, "    ")
+                for mod_info in mod_infos
+            )
+            parts.append('  </Mods>')
+        else:
+            parts.append('  <Mods/>')
         
-        # Удаление лишней пустой строки после декларации
-        lines = formatted_xml.split('\n')
-        if lines[1].strip() == '':
-            lines.pop(1)
+        parts.append('</ModList>')
+        parts.append('')
         
-        return '\n'.join(lines)
+        return '\n'.join(parts)
     
     def generate_rimpy_xml_extended(
         self, 
@@ -231,23 +376,35 @@ class XmlProcessor:
         Returns:
             Строка с XML содержимым.
         """
-        lines = ['<?xml version="1.0" encoding="utf-8"?>']
-        lines.append('<ModList>')
-        lines.append(f'  <Name>{list_name}</Name>')
-        lines.append('  <Version>1.0</Version>')
-        lines.append('  <Mods>')
+        lines = [
+            '<?xml version="1.0" encoding="utf-8"?>',
+            '<ModList>',
+            f'  <Name>{list_name}</Name>',
+            '  <Version>1.0</Version>',
+            '  <Mods>'
+        ]
         
-        for mod_info in mod_infos:
-            if include_workshop_ids:
-                comment = f"    <!-- Workshop ID: {mod_info.workshop_id}"
+        # Комментарий и элемент мода формируются одной f-строкой: на мод
+        # приходится одна запись списка без промежуточных конкатенаций
+        append = lines.append
+        if include_workshop_ids:
+            for mod_info in mod_infos:
                 if mod_info.name:
-                    comment += f" | {mod_info.name}"
-                comment += " -->"
-                lines.append(comment)
-            lines.append(f'    <li>{mod_info.package_id}</li>')
+                    append(
+                        f"    <!-- Workshop ID: {mod_info.workshop_id} | {mod_info.name} -->\n"
+                        f"    <li>{mod_info.package_id}</li>"
+                    )
+                else:
+                    append(
+                        f"    <!-- Workshop ID: {mod_info.workshop_id} -->\n"
+                        f"    <li>{mod_info.package_id}</li>"
+                    )
+        else:
+            for mod_info in mod_infos:
+                append(f'    <li>{mod_info.package_id}</li>')
         
-        lines.append('  </Mods>')
-        lines.append('</ModList>')
+        append('  </Mods>')
+        append('</ModList>')
         
         return '\n'.join(lines)
     
@@ -282,34 +439,79 @@ class XmlProcessor:
         Returns:
             Строка с XML содержимым.
         """
-        lines = ['<?xml version="1.0" encoding="utf-8"?>']
-        lines.append('<ModsConfigData>')
-        lines.append(f'    <version>{version}</version>')
-        lines.append('    <activeMods>')
+        return ''.join(
+            self._iter_mods_config_data(mod_infos, version, include_workshop_ids)
+        )
+    
+    @staticmethod
+    def _iter_mods_config_data(
+        mod_infos: List[ModInfo],
+        version: str,
+        include_workshop_ids: bool
+    ) -> Iterator[str]:
+        """
+        Построчно сформировать содержимое ModsConfigData.
+        
+        Каждая строка, кроме последней, заканчивается переводом строки,
+        поэтому ''.join() даёт тот же текст, что и запись в файл по частям.
+        
+        Args:
+            mod_infos: Список информации о модах.
+            version: Версия RimWorld.
+            include_workshop_ids: Включать ли workshop ID в комментарии.
+            
+        Yields:
+            Строки XML документа.
+        """
+        yield '<?xml version="1.0" encoding="utf-8"?>\n'
+        yield '<ModsConfigData>\n'
+        yield f'    <version>{version}</version>\n'
+        yield '    <activeMods>\n'
         
         for mod_info in mod_infos:
             if include_workshop_ids and mod_info.workshop_id:
-                comment = f"        <!-- Workshop ID: {mod_info.workshop_id}"
                 if mod_info.name:
-                    comment += f" | {mod_info.name}"
-                comment += " -->"
-                lines.append(comment)
-            lines.append(f'        <li>{mod_info.package_id}</li>')
+                    yield f"        <!-- Workshop ID: {mod_info.workshop_id} | {mod_info.name} -->\n"
+                else:
+                    yield f"        <!-- Workshop ID: {mod_info.workshop_id} -->\n"
+            yield f'        <li>{mod_info.package_id}</li>\n'
+        
+        yield '    </activeMods>\n'
         
-        lines.append('    </activeMods>')
+        yield _KNOWN_EXPANSIONS_BLOCK
         
-        # knownExpansions - базовые DLC RimWorld
-        lines.append('    <knownExpansions>')
-        lines.append('        <li>ludeon.rimworld</li>')
-        lines.append('        <li>ludeon.rimworld.royalty</li>')
-        lines.append('        <li>ludeon.rimworld.ideology</li>')
-        lines.append('        <li>ludeon.rimworld.biotech</li>')
-        lines.append('        <li>ludeon.rimworld.anomaly</li>')
-        lines.append('    </knownExpansions>')
+        yield '</ModsConfigData>'
+    
+    def write_mods_config_data(
+        self,
+        mod_infos: List[ModInfo],
+        output_path: str,
+        filename: str,
+        version: str = "1.6.4633",
+        include_workshop_ids: bool = True
+    ) -> Tuple[bool, str]:
+        """
+        Сгенерировать ModsConfigData и сразу записать его в файл.
         
-        lines.append('</ModsConfigData>')
+        В отличие от generate_mods_config_data_xml() + save_xml() документ
+        не собирается в памяти целиком - строки пишутся в файл по мере
+        формирования.
         
-        return '\n'.join(lines)
+        Args:
+            mod_infos: Список информации о модах.
+            output_path: Путь к директории для сохранения.
+            filename: Имя файла (без расширения или с .xml).
+            version: Версия RimWorld.
+            include_workshop_ids: Включать ли workshop ID в комментарии.
+            
+        Returns:
+            Кортеж (успех, полный путь к файлу или сообщение об ошибке).
+        """
+        return self._write_xml(
+            self._iter_mods_config_data(mod_infos, version, include_workshop_ids),
+            output_path,
+            filename
+        )
     
     def save_xml(
         self, 
@@ -325,6 +527,25 @@ class XmlProcessor:
             output_path: Путь к директории для сохранения.
             filename: Имя файла (без расширения или с .xml).
             
+        Returns:
+            Кортеж (успех, полный путь к файлу или сообщение об ошибке).
+        """
+        return self._write_xml((xml_content,), output_path, filename)
+    
+    def _write_xml(
+        self,
+        chunks: Iterable[str],
+        output_path: str,
+        filename: str
+    ) -> Tuple[bool, str]:
+        """
+        Записать XML файл из последовательности строк.
+        
+        Args:
+            chunks: Части содержимого XML.
+            output_path: Путь к директории для сохранения.
+            filename: Имя файла (без расширения или с .xml).
+            
         Returns:
             Кортеж (успех, полный путь к файлу или сообщение об ошибке).
         """
@@ -340,7 +561,7 @@ class XmlProcessor:
             
             # Запись файла
             with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(xml_content)
+                f.writelines(chunks)
             
             self._log(f"XML файл сохранён: {full_path}", "SUCCESS")
             return True, full_path
@@ -358,6 +579,9 @@ class XmlProcessor:
         """
         Проверить валидность XML файла.
         
+        Файл разбирается потоково: элементы модов подсчитываются и сразу
+        очищаются, поэтому дерево большого списка в памяти не строится.
+        
         Args:
             file_path: Путь к XML файлу.
             
@@ -365,17 +589,33 @@ class XmlProcessor:
             Кортеж (валидность, сообщение).
         """
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
+            mod_count = 0
+            has_mods = False
+            in_mods = False
+            depth = 0
             
-            if root.tag != "ModList":
-                return False, "Корневой элемент должен быть 'ModList'"
+            for event, elem in ET.iterparse(file_path, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if depth == 1 and elem.tag != "ModList":
+                        return False, "Корневой элемент должен быть 'ModList'"
+                    # Учитывается первый элемент Mods - прямой потомок корня
+                    if depth == 2 and elem.tag == "Mods" and not has_mods:
+                        has_mods = in_mods = True
+                    continue
+                
+                depth -= 1
+                if in_mods and depth == 2:
+                    mod_count += 1
+                elif depth == 1:
+                    in_mods = False
+                
+                if depth > 0:
+                    elem.clear()
             
-            mods_elem = root.find("Mods")
-            if mods_elem is None:
+            if not has_mods:
                 return False, "Отсутствует элемент 'Mods'"
             
-            mod_count = len(list(mods_elem))
             return True, f"XML валиден, содержит {mod_count} модов"
             
         except ET.ParseError as e:
@@ -387,6 +627,9 @@ class XmlProcessor:
         """
         Прочитать существующий RimPy XML и извлечь packageId.
         
+        Файл разбирается потоково, как в validate_xml_file: элементы li
+        очищаются после чтения, и дерево списка в памяти не строится.
+        
         Args:
             file_path: Путь к XML файлу.
             
@@ -394,17 +637,28 @@ class XmlProcessor:
             Список packageId из файла.
         """
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            mods_elem = root.find("Mods")
-            if mods_elem is None:
-                return []
-            
             package_ids = []
-            for li in mods_elem.findall("li"):
-                if li.text:
-                    package_ids.append(li.text.strip().lower())
+            has_mods = False
+            in_mods = False
+            depth = 0
+            
+            for event, elem in ET.iterparse(file_path, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    # Читается первый элемент Mods - прямой потомок корня
+                    if depth == 2 and elem.tag == "Mods" and not has_mods:
+                        has_mods = in_mods = True
+                    continue
+                
+                depth -= 1
+                if in_mods and depth == 2:
+                    if elem.tag == "li" and elem.text:
+                        package_ids.append(sys.intern(elem.text.strip().lower()))
+                elif depth == 1:
+                    in_mods = False
+                
+                if depth > 0:
+                    elem.clear()
             
             return package_ids
             